@@ -6,6 +6,8 @@ Centralized configuration management for the entire IoT system.
 Defines all constants, MQTT parameters, zone definitions, and physics parameters.
 """
 
+from enum import IntEnum
+
 # ===========================
 # MQTT BROKER CONFIGURATION
 # ===========================
@@ -13,16 +15,37 @@ MQTT_BROKER_HOST = "broker.hivemq.com"
 MQTT_BROKER_PORT = 1883
 MQTT_CLIENT_ID = "smart_speed_controller_01"
 MQTT_PUBLISH_INTERVAL = 0.5  # seconds (500 ms)
-MQTT_QOS = 1
+MQTT_QOS = 1  # online/offline status messages
+MQTT_QOS_TELEMETRY = 0  # periodic location/speed (overwritten every interval)
+MQTT_QOS_STATE = 1  # state messages (retained)
 MQTT_KEEP_ALIVE = 60
+MQTT_RECONNECT_MIN_DELAY = 1  # seconds
+MQTT_RECONNECT_MAX_DELAY = 30  # seconds
+MQTT_MAX_INFLIGHT = 1  # QoS>0 messages awaiting acknowledgement
+MQTT_PENDING_TELEMETRY = 10  # newest telemetry payloads kept while disconnected
+
+# Telemetry is only re-published when something moved past these thresholds
+TELEMETRY_DELTA_SPEED = 0.5  # km/h
+TELEMETRY_DELTA_POSITION = 0.0001  # published lat/lon units (0.1 world units)
+TELEMETRY_HEARTBEAT_INTERVAL = 5.0  # seconds between forced publishes
 
 # MQTT Topics
 MQTT_TOPICS = {
     "location": "vehicle/smart_speed/location",
     "speed": "vehicle/smart_speed/speed",
-    "state": "vehicle/smart_speed/state"
+    "state": "vehicle/smart_speed/state",
+    "telemetry": "vehicle/smart_speed/telemetry",  # location + speed + state in one message
+    "telemetry_bin": "vehicle/smart_speed/telemetry/bin"  # fixed-layout binary telemetry
 }
 
+# Publish telemetry as a fixed 37-byte little-endian record on the telemetry_bin
+# topic instead of JSON. The ESP32 firmware parses JSON, so this is off by default.
+MQTT_TELEMETRY_BINARY = False
+
+# Also publish the per-topic location/speed/state messages for subscribers
+# (e.g. older ESP32 firmware) that have not moved to the telemetry topic yet
+MQTT_PUBLISH_LEGACY_TOPICS = False
+
 # ===========================
 # VEHICLE PHYSICS PARAMETERS
 # ===========================
@@ -61,23 +84,33 @@ ZONES = {
     }
 }
 
+ZONE_GRID_CELL_SIZE = 100  # world units per cell of the zone lookup grid
+ZONE_CODEGEN_MAX_ZONES = 8  # up to this many zones, find_zone() is generated with inlined bounds
+
 # ===========================
 # SPEED CONTROL STATE THRESHOLDS
 # ===========================
 SPEED_WARNING_TOLERANCE = 5  # km/h (limit + 5 = WARNING state)
 SPEED_REGULATING_THRESHOLD = 5.1  # km/h (limit + 5 = REGULATING state)
 
-# Speed states
-SPEED_STATE_NORMAL = "NORMAL"
-SPEED_STATE_WARNING = "WARNING"
-SPEED_STATE_REGULATING = "REGULATING"
+# Speed states (small integer ids; .name is used for display and MQTT)
+class SpeedState(IntEnum):
+    NORMAL = 0
+    WARNING = 1
+    REGULATING = 2
+
+
+SPEED_STATE_NORMAL = SpeedState.NORMAL
+SPEED_STATE_WARNING = SpeedState.WARNING
+SPEED_STATE_REGULATING = SpeedState.REGULATING
+SPEED_STATE_NAMES = tuple(state.name for state in SpeedState)  # indexed by state id
 
 # ===========================
 # HUD DISPLAY SETTINGS
 # ===========================
 HUD_TEXT_SCALE = 0.06
 HUD_TEXT_HEIGHT = 0.95
-HUD_UPDATE_INTERVAL = 0.05  # seconds
+HUD_UPDATE_INTERVAL = 0.1  # seconds (10 Hz text refresh, independent of frame rate)
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
@@ -96,6 +129,7 @@ VEHICLE_SIZE = 2.0
 ENABLE_AUDIO = True
 WARNING_SOUND_FILE = "warning.wav"
 REGULATING_SOUND_FILE = "regulating.wav"
+AUDIO_QUEUE_SIZE = 4  # pending playback requests; the oldest is dropped when full
 
 # ===========================
 # GAME LOOP SETTINGS
@@ -0,0 +1,151 @@
+"""
+Smart Speed Control System - Physics Kernels Module
+===================================================
+
+Scalar numeric kernels for the per-frame physics, speed-state, zone lookup
+and camera-follow math.
+Functions take and return plain floats/ints so they can be compiled to
+native code with Numba. When Numba is not installed they run as regular
+Python functions with identical results.
+
+Author: IoT Development Team
+Version: 1.0
+"""
+
+from array import array
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # Optional: run the kernels as plain Python
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is unavailable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def step(velocity, heading, heading_velocity, rate, steering_input, dt,
+         max_speed, max_speed_limit, friction, steering_speed, distance,
+         sin_table, cos_table):
+    """
+    Advance vehicle velocity, heading and position by one frame.
+    
+    Args:
+        velocity (float): Velocity at the start of the frame in km/h
+        heading (float): Heading in degrees
+        heading_velocity (float): Heading rate in degrees per second
+        rate (float): Velocity change in km/h per second
+        steering_input (float): Steering input (-1 to 1)
+        dt (float): Frame duration in seconds
+        max_speed (float): Maximum vehicle speed in km/h
+        max_speed_limit (float): Regulated speed limit in km/h (negative for none)
+        friction (float): Passive friction in km/h per second
+        steering_speed (float): Steering rate in degrees per second
+        distance (float): Pre-integrated distance in meters (negative to compute)
+        sin_table (array): Sine lookup table at 0.1 degree resolution
+        cos_table (array): Cosine lookup table at 0.1 degree resolution
+    
+    Returns:
+        tuple: (velocity, heading, heading_velocity, dx, dy)
+    """
+    # Apply acceleration/deceleration
+    velocity = min(max_speed, max(0.0, velocity + rate * dt))
+    
+    # Apply max speed limit regulation
+    if max_speed_limit >= 0.0 and velocity > max_speed_limit:
+        overspeed = velocity - max_speed_limit
+        friction_factor = min(1.0, overspeed / 10.0)
+        decel = friction * 2.5 * friction_factor * dt
+        velocity = max(max_speed_limit * 0.95, velocity - decel)
+    
+    # Update heading based on steering
+    if abs(steering_input) > 0.01:
+        heading_velocity = steering_speed * steering_input
+    else:
+        heading_velocity *= 0.8  # Damping
+    
+    heading = (heading + heading_velocity * dt) % 360.0
+    
+    # Move vehicle based on velocity and heading
+    if distance < 0.0:
+        distance = (velocity / 3.6) * dt
+    idx = int(heading * 10) % len(sin_table)
+    return velocity, heading, heading_velocity, distance * cos_table[idx], distance * sin_table[idx]
+
+
+@njit(cache=True)
+def classify_speed(speed, speed_limit, tolerance):
+    """
+    Classify speed against a limit.
+    
+    Args:
+        speed (float): Current speed in km/h
+        speed_limit (float): Speed limit in km/h
+        tolerance (float): Overspeed tolerated before regulating, in km/h
+    
+    Returns:
+        int: 0 (NORMAL), 1 (WARNING) or 2 (REGULATING)
+    """
+    speed_over_limit = speed - speed_limit
+    if speed_over_limit > tolerance:
+        return 2
+    elif speed_over_limit > 0:
+        return 1
+    return 0
+
+
+@njit(cache=True)
+def zone_lookup(x, y, x_min, x_max, y_min, y_max):
+    """
+    Find the first zone whose bounds contain a point.
+    
+    Args:
+        x (float): X coordinate
+        y (float): Y coordinate
+        x_min (np.ndarray): Zone minimum x bounds
+        x_max (np.ndarray): Zone maximum x bounds
+        y_min (np.ndarray): Zone minimum y bounds
+        y_max (np.ndarray): Zone maximum y bounds
+    
+    Returns:
+        int: Index of the containing zone, -1 if outside all zones
+    """
+    for i in range(x_min.shape[0]):
+        if x_min[i] <= x <= x_max[i] and y_min[i] <= y <= y_max[i]:
+            return i
+    return -1
+
+
+@njit(cache=True, fastmath=True)
+def camera_offset(vx, vy, vz, heading_sin, heading_cos, distance, height):
+    """
+    Compute the follow-camera position behind and above the vehicle.
+    
+    Args:
+        vx, vy, vz (float): Vehicle position
+        heading_sin (float): Sine of the vehicle heading
+        heading_cos (float): Cosine of the vehicle heading
+        distance (float): Distance behind the vehicle
+        height (float): Height above the vehicle
+    
+    Returns:
+        tuple: Camera position (x, y, z)
+    """
+    return vx - distance * heading_cos, vy - distance * heading_sin, vz + height
+
+
+def warmup():
+    """Compile every kernel once so the first frames do not pay the JIT cost."""
+    if not HAVE_NUMBA:
+        return
+    bounds = np.zeros(1, dtype=np.float32)
+    table = array('f', [0.0])
+    step(0.0, 0.0, 0.0, 0.0, 0.0, 0.016, 1.0, -1.0, 0.0, 0.0, -1.0, table, table)
+    classify_speed(0.0, 0.0, 0.0)
+    zone_lookup(0.0, 0.0, bounds, bounds, bounds, bounds)
+    camera_offset(0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
@@ -14,6 +14,16 @@ Version: 1.0
 """
 
 import config
+from core._physics_kernels import classify_speed
+
+
+# State colors indexed by state id (NORMAL, WARNING, REGULATING)
+_STATE_COLORS = (
+    (0.0, 1.0, 0.0),  # Green
+    (1.0, 1.0, 0.0),  # Yellow
+    (1.0, 0.0, 0.0),  # Red
+)
+_STATE_COLORS_RGBA = tuple(color + (1.0,) for color in _STATE_COLORS)
 
 
 class ControlEngine:
@@ -23,22 +33,44 @@ class ControlEngine:
     Attributes:
         current_speed (float): Current vehicle speed in km/h
         speed_limit (float): Current speed limit in km/h
-        current_state (str): Current control state (NORMAL/WARNING/REGULATING)
+        current_state (SpeedState): Current control state (NORMAL/WARNING/REGULATING)
         state_callbacks (list): List of callbacks to notify on state changes
         regulation_factor (float): Acceleration reduction factor during regulation
     """
     
+    # Config values bound once at class load so the per-frame paths
+    # read class attributes instead of module globals
+    _TOL = float(config.SPEED_WARNING_TOLERANCE)
+    _MAX_OVERSPEED = config.SPEED_WARNING_TOLERANCE * 2
+    _S_NORM = config.SPEED_STATE_NORMAL
+    _S_WARN = config.SPEED_STATE_WARNING
+    _S_REG = config.SPEED_STATE_REGULATING
+    _STATES = tuple(config.SpeedState)  # classify_speed() result -> SpeedState
+    
     def __init__(self):
         """Initialize control engine with default values."""
         self.current_speed = 0.0
         self.speed_limit = config.VEHICLE_MAX_SPEED
         self.current_state = config.SPEED_STATE_NORMAL
         self.state_callbacks = []
+        self._cb_tuple = ()  # Snapshot of state_callbacks used for dispatch
         self.regulation_factor = 1.0
         
         self._previous_state = None
         self._warning_triggered = False
         self._regulation_triggered = False
+        
+        # Reused by get_current_state() instead of allocating per frame
+        self._state_dict = {
+            "state": config.SPEED_STATE_NAMES[self.current_state],
+            "state_id": self.current_state,
+            "color": _STATE_COLORS[self.current_state],
+            "color_rgba": _STATE_COLORS_RGBA[self.current_state],
+            "speed": 0.0,
+            "limit": self.speed_limit,
+            "overspeed": 0,
+            "regulation_factor": 1.0
+        }
     
     def add_state_callback(self, callback):
         """
@@ -49,6 +81,7 @@ class ControlEngine:
                                  signature: callback(old_state, new_state, speed, limit)
         """
         self.state_callbacks.append(callback)
+        self._cb_tuple = tuple(self.state_callbacks)
     
     def update(self, speed, speed_limit):
         """
@@ -64,10 +97,11 @@ class ControlEngine:
         
         # Determine state
         new_state = self._calculate_state(speed, speed_limit)
+        self.current_state = new_state
         
         # Trigger callbacks if state changed
         if new_state != self._previous_state:
-            old_state = self._previous_state or config.SPEED_STATE_NORMAL
+            old_state = self._previous_state or self._S_NORM
             self._notify_state_change(old_state, new_state)
             self._previous_state = new_state
         
@@ -83,39 +117,24 @@ class ControlEngine:
             speed_limit (float): Speed limit in km/h
         
         Returns:
-            str: State (NORMAL, WARNING, or REGULATING)
+            SpeedState: State (NORMAL, WARNING, or REGULATING)
         """
-        speed_over_limit = speed - speed_limit
-        
-        # Check regulating condition first (highest priority)
-        if speed_over_limit > config.SPEED_WARNING_TOLERANCE:
-            self.current_state = config.SPEED_STATE_REGULATING
-            return config.SPEED_STATE_REGULATING
-        
-        # Check warning condition
-        elif 0 < speed_over_limit <= config.SPEED_WARNING_TOLERANCE:
-            self.current_state = config.SPEED_STATE_WARNING
-            return config.SPEED_STATE_WARNING
-        
-        # Normal state
-        else:
-            self.current_state = config.SPEED_STATE_NORMAL
-            return config.SPEED_STATE_NORMAL
+        return self._STATES[classify_speed(float(speed), float(speed_limit), self._TOL)]
     
     def _update_regulation_factor(self):
         """
         Update acceleration regulation factor based on current state.
         Used to gradually reduce acceleration during regulation.
         """
-        if self.current_state == config.SPEED_STATE_REGULATING:
+        state = self.current_state
+        if state is self._S_REG:
             # Calculate how much over the limit we are
             overspeed = self.current_speed - self.speed_limit
-            max_overspeed = config.SPEED_WARNING_TOLERANCE * 2
             
             # Linear interpolation: at max overspeed, factor = 0 (no acceleration)
-            self.regulation_factor = max(0.0, 1.0 - (overspeed / max_overspeed))
+            self.regulation_factor = max(0.0, 1.0 - (overspeed / self._MAX_OVERSPEED))
         
-        elif self.current_state == config.SPEED_STATE_WARNING:
+        elif state is self._S_WARN:
             self.regulation_factor = 0.5  # 50% acceleration allowed
         
         else:  # NORMAL
@@ -126,12 +145,18 @@ class ControlEngine:
         Notify all registered callbacks of state change.
         
         Args:
-            old_state (str): Previous state
-            new_state (str): New state
+            old_state (SpeedState): Previous state
+            new_state (SpeedState): New state
         """
-        for callback in self.state_callbacks:
+        callbacks = self._cb_tuple
+        if not callbacks:
+            return
+        
+        speed = self.current_speed
+        limit = self.speed_limit
+        for callback in callbacks:
             try:
-                callback(old_state, new_state, self.current_speed, self.speed_limit)
+                callback(old_state, new_state, speed, limit)
             except Exception as e:
                 print(f"Error in state change callback: {e}")
     
@@ -149,35 +174,37 @@ class ControlEngine:
         """
         Get current control state information.
         
+        The same dictionary is updated in place and returned on every call,
+        so callers should read it rather than keep it.
+        
         Returns:
             dict: State information including state name, color, and regulation factor
         """
-        state_colors = {
-            config.SPEED_STATE_NORMAL: (0.0, 1.0, 0.0),      # Green
-            config.SPEED_STATE_WARNING: (1.0, 1.0, 0.0),     # Yellow
-            config.SPEED_STATE_REGULATING: (1.0, 0.0, 0.0)   # Red
-        }
-        
-        return {
-            "state": self.current_state,
-            "color": state_colors.get(self.current_state, (1.0, 1.0, 1.0)),
-            "speed": self.current_speed,
-            "limit": self.speed_limit,
-            "overspeed": max(0, self.current_speed - self.speed_limit),
-            "regulation_factor": self.regulation_factor
-        }
+        state = self.current_state
+        state_dict = self._state_dict
+        if state_dict["state_id"] is not state:
+            # State-derived fields only change on transitions
+            state_dict["state"] = config.SPEED_STATE_NAMES[state]
+            state_dict["state_id"] = state
+            state_dict["color"] = _STATE_COLORS[state]
+            state_dict["color_rgba"] = _STATE_COLORS_RGBA[state]
+        state_dict["speed"] = self.current_speed
+        state_dict["limit"] = self.speed_limit
+        state_dict["overspeed"] = max(0, self.current_speed - self.speed_limit)
+        state_dict["regulation_factor"] = self.regulation_factor
+        return state_dict
     
     def is_warning(self):
         """Check if system is in warning state."""
-        return self.current_state == config.SPEED_STATE_WARNING
+        return self.current_state is self._S_WARN
     
     def is_regulating(self):
         """Check if system is in regulating state."""
-        return self.current_state == config.SPEED_STATE_REGULATING
+        return self.current_state is self._S_REG
     
     def is_normal(self):
         """Check if system is in normal state."""
-        return self.current_state == config.SPEED_STATE_NORMAL
+        return self.current_state is self._S_NORM
     
     def reset(self):
         """Reset control engine to initial state."""
@@ -3,7 +3,8 @@ Smart Speed Control System - MQTT IoT Communication Module
 ==========================================================
 
 Handles all MQTT communication with the HiveMQ broker.
-Publishes vehicle telemetry (location, speed, state) every 500ms.
+Publishes vehicle telemetry (location, speed, state) every 500ms as a single
+combined message; the per-topic publishers are kept for existing subscribers.
 Implements automatic reconnection and clean session management.
 
 Uses paho-mqtt client library for robust MQTT protocol support.
@@ -13,22 +14,69 @@ Version: 1.0
 """
 
 import json
-import time
+import socket
+import struct
 import threading
-import paho.mqtt.client as mqtt
+import time
+import logging
+from collections import deque
 import config
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Fixed-schema location payload, formatted straight into bytes
+_LOCATION_PAYLOAD = b'{"lat":%.6f,"lon":%.6f,"timestamp":%.3f}'
+
+# Binary telemetry wire format (37 bytes, little-endian, packed):
+#   ts, lat, lon: float64 | speed, limit, heading: float32 | state: uint8
+# Equivalent NumPy record for subscribers:
+#   np.dtype([('ts', '<f8'), ('lat', '<f8'), ('lon', '<f8'), ('speed', '<f4'),
+#             ('limit', '<f4'), ('heading', '<f4'), ('state', 'u1')])
+TELEMETRY_STRUCT = struct.Struct('<dddfffB')
+
+
+def _dumps(obj):
+    """
+    Serialize a payload dictionary to compact JSON bytes.
+    
+    Uses orjson when installed (C encoder, returns bytes directly),
+    otherwise the standard library encoder with compact separators.
+    
+    Args:
+        obj (dict): Payload to serialize
+    
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 
 class SmartSpeedMQTTClient:
     """
     MQTT client for Smart Speed Control System.
     
+    Threading: the simulation thread does not publish. It hands the latest
+    telemetry snapshot to main.py's "mqtt-publisher" thread (_mqtt_worker)
+    through a single-slot Condition, where a newer snapshot replaces one not
+    yet taken. That worker is the only caller of the publish methods. The
+    simulation thread only calls connect()/disconnect() and reads status,
+    and paho's network loop runs on its own "mqtt-loop" thread. With a
+    single publisher and paho's thread-safe publish(), the publish path
+    takes no extra lock.
+    
     Attributes:
         broker_host (str): MQTT broker hostname/IP
         broker_port (int): MQTT broker port
-        client (mqtt.Client): Paho MQTT client instance
+        client (paho.mqtt.client.Client): Paho MQTT client instance
         connected (bool): Current connection status
-        last_publish_time (float): Timestamp of last publication
+        last_publish_time (float): Monotonic time of last publication
     """
     
     def __init__(self):
@@ -36,27 +84,44 @@ class SmartSpeedMQTTClient:
         self.broker_host = config.MQTT_BROKER_HOST
         self.broker_port = config.MQTT_BROKER_PORT
         self.client = None
+        self._mqtt_mod = None  # paho.mqtt.client, imported on first client creation
         self.connected = False
         self.last_publish_time = 0
-        self._lock = threading.Lock()
+        self._buf = bytearray(TELEMETRY_STRUCT.size)  # Reused binary telemetry buffer
+        self._pending = deque(maxlen=config.MQTT_PENDING_TELEMETRY)  # Newest-wins outage buffer
+        self._last = {"lat": None, "lon": None, "speed": None, "limit": None, "state": None}
+        self._last_telemetry_time = 0.0
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize and configure MQTT client."""
+        # Imported here so importing this module (e.g. for TELEMETRY_STRUCT)
+        # does not load paho until a client is actually created
+        import paho.mqtt.client as mqtt
+        self._mqtt_mod = mqtt
+        
         self.client = mqtt.Client(
             client_id=config.MQTT_CLIENT_ID,
             clean_session=True,
             protocol=mqtt.MQTTv311
         )
         
+        # Back off reconnect attempts and bound QoS>0 messages in flight
+        self.client.reconnect_delay_set(
+            min_delay=config.MQTT_RECONNECT_MIN_DELAY,
+            max_delay=config.MQTT_RECONNECT_MAX_DELAY
+        )
+        self.client.max_inflight_messages_set(config.MQTT_MAX_INFLIGHT)
+        
         # Set callbacks
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
-        self.client.on_publish = self._on_publish
+        # No on_publish: fire-and-forget QoS 0 telemetry needs no per-message
+        # callback dispatch on paho's network thread
         self.client.on_message = self._on_message
         
         # Set will message for connection state notification
-        will_payload = json.dumps({
+        will_payload = _dumps({
             "status": "offline",
             "timestamp": time.time()
         })
@@ -81,8 +146,18 @@ class SmartSpeedMQTTClient:
             self.connected = True
             print(f"[MQTT] Connected to broker {self.broker_host}:{self.broker_port}")
             
+            # Label paho's network thread and disable Nagle so small telemetry
+            # packets are not held back waiting for delayed ACKs
+            threading.current_thread().name = "mqtt-loop"
+            sock = self.client.socket()
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError as e:
+                    print(f"[MQTT] Could not set TCP_NODELAY: {e}")
+            
             # Publish online status
-            online_payload = json.dumps({
+            online_payload = _dumps({
                 "status": "online",
                 "timestamp": time.time()
             })
@@ -94,7 +169,7 @@ class SmartSpeedMQTTClient:
             )
         else:
             self.connected = False
-            error_msg = mqtt.connack_string(rc)
+            error_msg = self._mqtt_mod.connack_string(rc)
             print(f"[MQTT] Connection failed: {error_msg} (code {rc})")
     
     def _on_disconnect(self, client, userdata, rc):
@@ -112,17 +187,6 @@ class SmartSpeedMQTTClient:
         else:
             print("[MQTT] Disconnected from broker")
     
-    def _on_publish(self, client, userdata, mid):
-        """
-        MQTT publish callback (message ID mid successfully published).
-        
-        Args:
-            client: MQTT client instance
-            userdata: User data
-            mid (int): Message ID
-        """
-        pass  # Silent operation - no logging for each publish
-    
     def _on_message(self, client, userdata, msg):
         """
         MQTT message receive callback.
@@ -186,27 +250,22 @@ class SmartSpeedMQTTClient:
         # This allows location, speed, and state to publish together
         
         try:
-            with self._lock:
-                payload = json.dumps({
-                    "lat": round(latitude, 6),
-                    "lon": round(longitude, 6),
-                    "timestamp": time.time()
-                })
-                
-                result = self.client.publish(
-                    config.MQTT_TOPICS["location"],
-                    payload,
-                    qos=config.MQTT_QOS,
-                    retain=False
-                )
-                
-                if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    return True
-                else:
-                    print(f"[MQTT] Publish error for location: {result.rc}")
-                    return False
+            payload = _LOCATION_PAYLOAD % (latitude, longitude, time.time())
+            
+            result = self.client.publish(
+                config.MQTT_TOPICS["location"],
+                payload,
+                qos=config.MQTT_QOS_TELEMETRY,
+                retain=False
+            )
+            
+            if result.rc == self._mqtt_mod.MQTT_ERR_SUCCESS:
+                return True
+            else:
+                logger.warning("[MQTT] Publish error for location: %s", result.rc)
+                return False
         except Exception as e:
-            print(f"[MQTT] Error publishing location: {e}")
+            logger.warning("[MQTT] Error publishing location: %s", e)
             return False
     
     def publish_speed(self, speed, speed_limit):
@@ -224,37 +283,37 @@ class SmartSpeedMQTTClient:
         # This allows location, speed, and state to publish together
         
         try:
-            with self._lock:
-                payload = json.dumps({
-                    "speed": round(speed, 2),
-                    "limit": round(speed_limit, 2),
-                    "overspeed": round(max(0, speed - speed_limit), 2),
-                    "timestamp": time.time()
-                })
-                
-                result = self.client.publish(
-                    config.MQTT_TOPICS["speed"],
-                    payload,
-                    qos=config.MQTT_QOS,
-                    retain=False
-                )
-                
-                if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    return True
-                else:
-                    print(f"[MQTT] Publish error for speed: {result.rc}")
-                    return False
+            payload = _dumps({
+                "speed": round(speed, 2),
+                "limit": round(speed_limit, 2),
+                "overspeed": round(max(0, speed - speed_limit), 2),
+                "timestamp": time.time()
+            })
+            
+            result = self.client.publish(
+                config.MQTT_TOPICS["speed"],
+                payload,
+                qos=config.MQTT_QOS_TELEMETRY,
+                retain=False
+            )
+            
+            if result.rc == self._mqtt_mod.MQTT_ERR_SUCCESS:
+                return True
+            else:
+                logger.warning("[MQTT] Publish error for speed: %s", result.rc)
+                return False
         except Exception as e:
-            print(f"[MQTT] Error publishing speed: {e}")
+            logger.warning("[MQTT] Error publishing speed: %s", e)
             return False
     
-    def publish_state(self, state, color_rgb=None):
+    def publish_state(self, state, color_rgb=None, retain=True):
         """
         Publish current control system state.
         
         Args:
             state (str): Current state (NORMAL/WARNING/REGULATING)
             color_rgb (tuple): RGB color tuple (optional)
+            retain (bool): Retain the message; pass True only on state transitions
         
         Returns:
             bool: True if publish was successful
@@ -263,35 +322,207 @@ class SmartSpeedMQTTClient:
         # This allows location, speed, and state to publish together
         
         try:
-            with self._lock:
-                payload_dict = {
-                    "state": state,
-                    "timestamp": time.time()
+            payload_dict = {
+                "state": state,
+                "timestamp": time.time()
+            }
+            
+            if color_rgb:
+                payload_dict["color"] = {
+                    "r": int(color_rgb[0] * 255),
+                    "g": int(color_rgb[1] * 255),
+                    "b": int(color_rgb[2] * 255)
                 }
-                
+            
+            payload = _dumps(payload_dict)
+            
+            result = self.client.publish(
+                config.MQTT_TOPICS["state"],
+                payload,
+                qos=config.MQTT_QOS_STATE,
+                retain=retain
+            )
+            
+            if result.rc == self._mqtt_mod.MQTT_ERR_SUCCESS:
+                return True
+            else:
+                logger.warning("[MQTT] Publish error for state: %s", result.rc)
+                return False
+        except Exception as e:
+            logger.warning("[MQTT] Error publishing state: %s", e)
+            return False
+    
+    def publish_telemetry(self, latitude, longitude, speed, speed_limit, state,
+                          color_rgb=None, heading=0.0, retain=False):
+        """
+        Publish location, speed and state as a single combined message.
+        
+        Replaces three back-to-back publishes per tick with one, so each
+        telemetry tick costs one MQTT frame and one JSON encode. Telemetry
+        goes out at MQTT_QOS_TELEMETRY (QoS 0), fire-and-forget with no
+        PUBACK; retained state transitions use MQTT_QOS_STATE.
+        With MQTT_TELEMETRY_BINARY enabled the message is packed into the
+        fixed TELEMETRY_STRUCT layout instead of JSON.
+        
+        Publishes are skipped while position and speed move less than the
+        TELEMETRY_DELTA_* thresholds and limit and state are unchanged,
+        except for a heartbeat every TELEMETRY_HEARTBEAT_INTERVAL seconds.
+        
+        Args:
+            latitude (float): Latitude (simulated from X coordinate)
+            longitude (float): Longitude (simulated from Y coordinate)
+            speed (float): Current speed in km/h
+            speed_limit (float): Current speed limit in km/h
+            state (SpeedState): Current state
+            color_rgb (tuple): RGB color tuple (optional)
+            heading (float): Vehicle heading in degrees (binary format only)
+            retain (bool): Retain the message; pass True only on state transitions
+        
+        Returns:
+            bool: True if publish was successful (or skipped as unchanged)
+        """
+        if self._telemetry_unchanged(latitude, longitude, speed, speed_limit, state):
+            return True
+        
+        try:
+            if config.MQTT_TELEMETRY_BINARY:
+                topic = config.MQTT_TOPICS["telemetry_bin"]
+                payload = self._pack_telemetry(latitude, longitude, speed, speed_limit, heading, state)
+            else:
+                state_dict = {"name": state.name}
                 if color_rgb:
-                    payload_dict["color"] = {
+                    state_dict["color"] = {
                         "r": int(color_rgb[0] * 255),
                         "g": int(color_rgb[1] * 255),
                         "b": int(color_rgb[2] * 255)
                     }
                 
-                payload = json.dumps(payload_dict)
-                
-                result = self.client.publish(
-                    config.MQTT_TOPICS["state"],
-                    payload,
-                    qos=config.MQTT_QOS,
-                    retain=True  # Retain state message
-                )
-                
-                if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    return True
-                else:
-                    print(f"[MQTT] Publish error for state: {result.rc}")
-                    return False
+                topic = config.MQTT_TOPICS["telemetry"]
+                payload = _dumps({
+                    "loc": {
+                        "lat": round(latitude, 6),
+                        "lon": round(longitude, 6)
+                    },
+                    "speed": {
+                        "v": round(speed, 2),
+                        "limit": round(speed_limit, 2),
+                        "over": round(max(0, speed - speed_limit), 2)
+                    },
+                    "state": state_dict,
+                    "ts": time.time()
+                })
+            
+            last = self._last
+            last["lat"] = latitude
+            last["lon"] = longitude
+            last["speed"] = speed
+            last["limit"] = speed_limit
+            last["state"] = state
+            self._last_telemetry_time = time.monotonic()
+            
+            return self._send_telemetry(topic, payload, retain)
         except Exception as e:
-            print(f"[MQTT] Error publishing state: {e}")
+            logger.warning("[MQTT] Error publishing telemetry: %s", e)
+            return False
+    
+    def _telemetry_unchanged(self, latitude, longitude, speed, speed_limit, state):
+        """
+        Check whether telemetry is within the delta thresholds of the last payload.
+        
+        Args:
+            latitude (float): Latitude (simulated from X coordinate)
+            longitude (float): Longitude (simulated from Y coordinate)
+            speed (float): Current speed in km/h
+            speed_limit (float): Current speed limit in km/h
+            state (SpeedState): Current state
+        
+        Returns:
+            bool: True if the publish can be skipped
+        """
+        last = self._last
+        if last["speed"] is None:
+            return False
+        if time.monotonic() - self._last_telemetry_time >= config.TELEMETRY_HEARTBEAT_INTERVAL:
+            return False
+        return (
+            state == last["state"]
+            and speed_limit == last["limit"]
+            and abs(speed - last["speed"]) < config.TELEMETRY_DELTA_SPEED
+            and abs(latitude - last["lat"]) < config.TELEMETRY_DELTA_POSITION
+            and abs(longitude - last["lon"]) < config.TELEMETRY_DELTA_POSITION
+        )
+    
+    def _pack_telemetry(self, latitude, longitude, speed, speed_limit, heading, state):
+        """
+        Pack telemetry into the fixed-size TELEMETRY_STRUCT layout.
+        
+        Numeric fields are written in place into a preallocated buffer, so
+        no payload dictionary or JSON string is built. Subscribers decode
+        with TELEMETRY_STRUCT.unpack().
+        
+        Args:
+            latitude (float): Latitude (simulated from X coordinate)
+            longitude (float): Longitude (simulated from Y coordinate)
+            speed (float): Current speed in km/h
+            speed_limit (float): Current speed limit in km/h
+            heading (float): Vehicle heading in degrees
+            state (SpeedState): Current state
+        
+        Returns:
+            bytes: Packed payload
+        """
+        TELEMETRY_STRUCT.pack_into(
+            self._buf, 0,
+            time.time(), latitude, longitude, speed, speed_limit, heading, state
+        )
+        return bytes(self._buf)
+    
+    def _send_telemetry(self, topic, payload, retain=False):
+        """
+        Publish an encoded telemetry payload, buffering it while offline.
+        
+        While disconnected only the newest MQTT_PENDING_TELEMETRY payloads
+        are kept (older telemetry is worthless), and they are flushed ahead
+        of the next payload once the connection is back. Flushing happens
+        on the publishing thread, so there is still a single producer.
+        
+        Retained payloads mark state transitions; they are sent with
+        MQTT_QOS_STATE so the broker stores them reliably.
+        
+        Args:
+            topic (str): MQTT topic
+            payload (bytes): Encoded payload
+            retain (bool): Retain the message on the broker
+        
+        Returns:
+            bool: True if publish was successful
+        """
+        if not self.connected:
+            self._pending.append((topic, payload, retain))
+            return False
+        
+        pending = self._pending
+        while pending:
+            pending_topic, pending_payload, pending_retain = pending.popleft()
+            self.client.publish(
+                pending_topic,
+                pending_payload,
+                qos=config.MQTT_QOS_STATE if pending_retain else config.MQTT_QOS_TELEMETRY,
+                retain=pending_retain
+            )
+        
+        result = self.client.publish(
+            topic,
+            payload,
+            qos=config.MQTT_QOS_STATE if retain else config.MQTT_QOS_TELEMETRY,
+            retain=retain
+        )
+        
+        if result.rc == self._mqtt_mod.MQTT_ERR_SUCCESS:
+            self.last_publish_time = time.monotonic()
+            return True
+        else:
+            logger.warning("[MQTT] Publish error for telemetry: %s", result.rc)
             return False
     
     def _should_publish(self):
@@ -302,7 +533,7 @@ class SmartSpeedMQTTClient:
         Returns:
             bool: True if ready to publish
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_publish_time >= config.MQTT_PUBLISH_INTERVAL:
             return True
         return False
@@ -323,10 +554,21 @@ class SmartSpeedMQTTClient:
         Returns:
             dict: Status information
         """
-        return {
-            "connected": self.connected,
-            "broker_host": self.broker_host,
-            "broker_port": self.broker_port,
-            "client_id": config.MQTT_CLIENT_ID,
-            "last_publish": self.last_publish_time
-        }
+        return self.fill_status({})
+    
+    def fill_status(self, out):
+        """
+        Write current MQTT client status into an existing dictionary.
+        
+        Args:
+            out (dict): Dictionary to update in place
+        
+        Returns:
+            dict: The same dictionary, for chaining
+        """
+        out["connected"] = self.connected
+        out["broker_host"] = self.broker_host
+        out["broker_port"] = self.broker_port
+        out["client_id"] = config.MQTT_CLIENT_ID
+        out["last_publish"] = self.last_publish_time
+        return out
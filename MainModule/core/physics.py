@@ -13,7 +13,39 @@ Version: 1.0
 """
 
 import math
+from array import array
+import numpy as np
 import config
+from core._physics_kernels import step
+
+
+# Sin/cos lookup tables at 0.1 degree resolution, indexed by int(heading * 10)
+_TRIG_STEPS = 3600
+_SIN = array('f', [math.sin(math.radians(i / 10.0)) for i in range(_TRIG_STEPS)])
+_COS = array('f', [math.cos(math.radians(i / 10.0)) for i in range(_TRIG_STEPS)])
+
+
+def _integrate_substeps(velocity, rate, dt, max_speed):
+    """
+    Integrate velocity over a long frame in fixed PHYSICS_UPDATE_RATE micro-steps.
+    
+    The micro-steps are evaluated as one vectorized NumPy pass instead of a
+    Python loop. Because the rate is constant over the frame, clipping the
+    cumulative sum matches clamping after every step.
+    
+    Args:
+        velocity (float): Velocity at the start of the frame in km/h
+        rate (float): Velocity change in km/h per second
+        dt (float): Frame duration in seconds
+        max_speed (float): Maximum vehicle speed in km/h
+    
+    Returns:
+        tuple: (final velocity in km/h, distance travelled in meters)
+    """
+    n = int(dt / config.PHYSICS_UPDATE_RATE)
+    sub_dt = dt / n
+    v = np.clip(velocity + np.cumsum(np.full(n, rate * sub_dt)), 0.0, max_speed)
+    return float(v[-1]), float(v.sum()) * sub_dt / 3.6
 
 
 class VehiclePhysics:
@@ -21,7 +53,7 @@ class VehiclePhysics:
     Realistic vehicle physics engine with acceleration, friction, and speed control.
     
     Attributes:
-        position (tuple): Current vehicle position (x, y, z)
+        position (np.ndarray): Current vehicle position (x, y, z), float32
         velocity (float): Current velocity in km/h
         heading (float): Current heading angle in degrees
         acceleration_input (float): Input acceleration (-1 to 1)
@@ -29,9 +61,21 @@ class VehiclePhysics:
         is_braking (bool): Whether brakes are applied
     """
     
+    # Config values bound once at class load so update() reads class
+    # attributes instead of module globals every physics step (floats, so the
+    # compiled kernel is specialized once for float arguments)
+    _MAX_SPEED = float(config.VEHICLE_MAX_SPEED)
+    _ACCEL = float(config.VEHICLE_ACCELERATION)
+    _DECEL_NORMAL = float(config.VEHICLE_DECELERATION_NORMAL)
+    _DECEL_BRAKE = float(config.VEHICLE_DECELERATION_BRAKE)
+    _FRICTION = float(config.VEHICLE_FRICTION)
+    _STEERING_SPEED = float(config.VEHICLE_STEERING_SPEED)
+    _SUBSTEP_THRESHOLD = 2 * config.PHYSICS_UPDATE_RATE  # longer frames are sub-stepped
+    
     def __init__(self):
         """Initialize vehicle physics with default values."""
-        self.position = list(config.VEHICLE_INITIAL_POSITION)
+        self.position = np.array(config.VEHICLE_INITIAL_POSITION, dtype=np.float32)
+        self._position_tuple = tuple(self.position.tolist())  # Rebuilt only when position moves
         self.velocity = 0.0  # km/h
         self.heading = 0.0  # degrees (0 = +X direction)
         
@@ -53,47 +97,39 @@ class VehiclePhysics:
         Returns:
             tuple: Updated (velocity, position)
         """
-        # Apply acceleration/deceleration
+        # Determine acceleration/deceleration rate (km/h per second)
         if self.is_braking:
-            decel = config.VEHICLE_DECELERATION_BRAKE * dt
-            self.velocity = max(0, self.velocity - decel)
+            rate = -self._DECEL_BRAKE
         elif self.acceleration_input > 0:
-            accel = config.VEHICLE_ACCELERATION * self.acceleration_input * max_acceleration * dt
-            self.velocity = min(config.VEHICLE_MAX_SPEED, self.velocity + accel)
+            rate = self._ACCEL * self.acceleration_input * max_acceleration
         elif self.acceleration_input < 0:
-            decel = config.VEHICLE_DECELERATION_NORMAL * abs(self.acceleration_input) * dt
-            self.velocity = max(0, self.velocity - decel)
+            rate = -self._DECEL_NORMAL * abs(self.acceleration_input)
         else:
             # Passive friction
-            friction = config.VEHICLE_FRICTION * dt
-            self.velocity = max(0, self.velocity - friction)
-        
-        # Apply max speed limit regulation
-        if max_speed_limit is not None and self.velocity > max_speed_limit:
-            # Gradual deceleration
-            overspeed = self.velocity - max_speed_limit
-            friction_factor = min(1.0, overspeed / 10.0)  # Scale friction with overspeed
-            decel = config.VEHICLE_FRICTION * 2.5 * friction_factor * dt
-            self.velocity = max(max_speed_limit * 0.95, self.velocity - decel)
+            rate = -self._FRICTION
         
-        # Update heading based on steering
-        if abs(self.steering_input) > 0.01:
-            self._heading_velocity = config.VEHICLE_STEERING_SPEED * self.steering_input
-        else:
-            self._heading_velocity *= 0.8  # Damping
+        distance = -1.0
+        if dt > self._SUBSTEP_THRESHOLD:
+            # Dropped frame: integrate in fixed micro-steps instead of one large Euler step
+            self.velocity, distance = _integrate_substeps(self.velocity, rate, dt, self._MAX_SPEED)
+            rate = 0.0
         
-        self.heading += self._heading_velocity * dt
-        self.heading = self.heading % 360.0
+        # Velocity, regulation, steering and displacement in one compiled kernel
+        self.velocity, self.heading, self._heading_velocity, dx, dy = step(
+            self.velocity, self.heading, self._heading_velocity, rate,
+            self.steering_input, dt, self._MAX_SPEED,
+            -1.0 if max_speed_limit is None else float(max_speed_limit),
+            self._FRICTION, self._STEERING_SPEED, distance, _SIN, _COS
+        )
         
-        # Move vehicle based on velocity and heading
-        # Convert heading to radians
-        heading_rad = math.radians(self.heading)
-        distance = (self.velocity / 3.6) * dt  # Convert km/h to m/s, then to meters per dt
+        # At rest the previous tuple is returned again, so callers can skip work
+        if dx or dy:
+            position = self.position
+            position[0] += dx
+            position[1] += dy
+            self._position_tuple = tuple(position.tolist())
         
-        self.position[0] += distance * math.cos(heading_rad)
-        self.position[1] += distance * math.sin(heading_rad)
-        
-        return self.velocity, tuple(self.position)
+        return self.velocity, self._position_tuple
     
     def set_inputs(self, acceleration, steering, braking):
         """
@@ -104,13 +140,29 @@ class VehiclePhysics:
             steering (float): -1 (left) to 1 (right)
             braking (bool): Whether brakes are being applied
         """
-        self.acceleration_input = max(-1.0, min(1.0, acceleration))
-        self.steering_input = max(-1.0, min(1.0, steering))
+        self.acceleration_input = float(max(-1.0, min(1.0, acceleration)))
+        self.steering_input = float(max(-1.0, min(1.0, steering)))
         self.is_braking = braking
     
+    def set_position(self, x, y, z=0.0):
+        """
+        Move the vehicle without simulating.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+            z (float): Z coordinate (optional)
+        """
+        position = self.position
+        position[0] = x
+        position[1] = y
+        position[2] = z
+        self._position_tuple = tuple(position.tolist())
+    
     def reset(self):
         """Reset vehicle to initial state."""
-        self.position = list(config.VEHICLE_INITIAL_POSITION)
+        self.position[:] = config.VEHICLE_INITIAL_POSITION
+        self._position_tuple = tuple(self.position.tolist())
         self.velocity = 0.0
         self.heading = 0.0
         self.acceleration_input = 0.0
@@ -126,7 +178,7 @@ class VehiclePhysics:
             dict: Current state including position, velocity, heading
         """
         return {
-            "position": tuple(self.position),
+            "position": tuple(self.position.tolist()),
             "velocity": self.velocity,
             "heading": self.heading,
             "acceleration_input": self.acceleration_input,
@@ -10,6 +10,7 @@ Author: IoT Development Team
 Version: 1.0
 """
 
+from math import sin, cos, radians
 import config
 
 
@@ -19,12 +20,16 @@ class Vehicle:
     
     Attributes:
         position (tuple): Current vehicle position (x, y, z)
+        position_arr (np.ndarray): Position buffer shared with the physics engine
         velocity (float): Current velocity in km/h
         heading (float): Current heading in degrees
         physics_engine (VehiclePhysics): Physics simulation engine
         node (NodePath): Panda3D node representing the vehicle
     """
     
+    __slots__ = ('physics_engine', 'node', 'position_arr', 'velocity', 'heading',
+                 '_max_speed_limit', '_heading_sin', '_heading_cos', '_last_pos', '_last_heading')
+    
     def __init__(self, physics_engine):
         """
         Initialize vehicle instance.
@@ -34,9 +39,24 @@ class Vehicle:
         """
         self.physics_engine = physics_engine
         self.node = None  # Will be set by 3D engine
-        self.position = (0, 0, 0)
+        self.position_arr = physics_engine.position  # Shared buffer, updated in place by physics
         self.velocity = 0.0
         self.heading = 0.0
+        self._max_speed_limit = config.VEHICLE_MAX_SPEED
+        self._heading_sin = 0.0  # sin/cos of heading, refreshed when heading changes
+        self._heading_cos = 1.0
+        self._last_pos = None  # Position tuple and heading last applied to the 3D node
+        self._last_heading = None
+    
+    @property
+    def position(self):
+        """
+        Current position (x, y, z) as a tuple of floats.
+        
+        Builds a new tuple on every access; per-frame code reads position_arr
+        or reuses the tuple returned by update().
+        """
+        return tuple(self.position_arr.tolist())
     
     def update(self, dt, acceleration, steering, braking, speed_regulation_factor=1.0):
         """
@@ -56,17 +76,20 @@ class Vehicle:
         self.physics_engine.set_inputs(acceleration, steering, braking)
         
         # Update physics with speed regulation
-        max_speed = getattr(self, '_max_speed_limit', config.VEHICLE_MAX_SPEED)
         velocity, position = self.physics_engine.update(
             dt,
-            max_speed_limit=max_speed,
+            max_speed_limit=self._max_speed_limit,
             max_acceleration=speed_regulation_factor
         )
         
         # Update vehicle state
         self.velocity = velocity
-        self.position = position
-        self.heading = self.physics_engine.heading
+        heading = self.physics_engine.heading
+        if heading != self.heading:
+            self.heading = heading
+            heading_rad = radians(heading)
+            self._heading_sin = sin(heading_rad)
+            self._heading_cos = cos(heading_rad)
         
         return velocity, position
     
@@ -79,10 +102,7 @@ class Vehicle:
             y (float): Y coordinate
             z (float): Z coordinate (optional)
         """
-        self.position = (x, y, z)
-        self.physics_engine.position[0] = x
-        self.physics_engine.position[1] = y
-        self.physics_engine.position[2] = z
+        self.physics_engine.set_position(x, y, z)
     
     def get_position(self):
         """
@@ -122,10 +142,11 @@ class Vehicle:
     
     def reset(self):
         """Reset vehicle to initial state."""
-        self.physics_engine.reset()
-        self.position = (0, 0, 0)
+        self.physics_engine.reset()  # Refills the shared position buffer in place
         self.velocity = 0.0
         self.heading = 0.0
+        self._heading_sin = 0.0
+        self._heading_cos = 1.0
     
     def get_state(self):
         """
@@ -149,14 +170,25 @@ class Vehicle:
             node (NodePath): Panda3D node
         """
         self.node = node
+        self._last_pos = None
     
-    def update_3d_representation(self):
-        """Update 3D node position and rotation to match vehicle state."""
+    def update_3d_representation(self, position=None):
+        """
+        Update 3D node position and rotation to match vehicle state.
+        
+        Args:
+            position (tuple): Position (x, y, z) returned by update(); read
+                from the physics engine when omitted
+        """
         if self.node:
-            x, y, z = self.position
-            self.node.setX(x)
-            self.node.setY(y)
-            self.node.setZ(z)
+            if position is None:
+                position = self.position
+            heading = self.heading
+            if position == self._last_pos and heading == self._last_heading:
+                return  # Unchanged (e.g. at rest), skip the transform update
+            self._last_pos = position
+            self._last_heading = heading
             
-            # Set heading rotation (rotate around Z-axis)
-            self.node.setH(self.heading)
+            # Position and heading (rotation around Z-axis) in one transform update
+            x, y, z = position
+            self.node.setPosHpr(x, y, z, heading, 0, 0)
@@ -9,7 +9,10 @@ Author: IoT Development Team
 Version: 1.0
 """
 
+from bisect import bisect_left
+import numpy as np
 import config
+from core._physics_kernels import HAVE_NUMBA, zone_lookup
 
 
 class Zone:
@@ -21,10 +24,15 @@ class Zone:
         name (str): Display name of the zone
         speed_limit (float): Speed limit in km/h
         color (tuple): RGB color for zone visualization
+        color_rgba (tuple): color with full alpha, for HUD text
         x_range (tuple): (min_x, max_x) boundaries
         y_range (tuple): (min_y, max_y) boundaries
+        x_min, x_max, y_min, y_max (float): Flattened boundaries
     """
     
+    __slots__ = ('zone_id', 'name', 'speed_limit', 'color', 'color_rgba', 'x_range', 'y_range',
+                 'x_min', 'x_max', 'y_min', 'y_max')
+    
     def __init__(self, zone_id, name, speed_limit, color, x_range, y_range):
         """
         Initialize a speed control zone.
@@ -41,8 +49,12 @@ class Zone:
         self.name = name
         self.speed_limit = speed_limit
         self.color = color
+        self.color_rgba = tuple(color) + (1.0,)
         self.x_range = x_range
         self.y_range = y_range
+        # Flattened bounds for the containment test
+        self.x_min, self.x_max = x_range
+        self.y_min, self.y_max = y_range
     
     def contains_point(self, x, y):
         """
@@ -55,9 +67,7 @@ class Zone:
         Returns:
             bool: True if point is within zone boundaries
         """
-        x_min, x_max = self.x_range
-        y_min, y_max = self.y_range
-        return x_min <= x <= x_max and y_min <= y <= y_max
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
     
     def get_boundary_distance(self, x, y):
         """
@@ -71,13 +81,10 @@ class Zone:
             float: Minimum distance to any boundary
         """
         if self.contains_point(x, y):
-            x_min, x_max = self.x_range
-            y_min, y_max = self.y_range
-            
-            dist_x_min = abs(x - x_min)
-            dist_x_max = abs(x - x_max)
-            dist_y_min = abs(y - y_min)
-            dist_y_max = abs(y - y_max)
+            dist_x_min = abs(x - self.x_min)
+            dist_x_max = abs(x - self.x_max)
+            dist_y_min = abs(y - self.y_min)
+            dist_y_max = abs(y - self.y_max)
             
             return min(dist_x_min, dist_x_max, dist_y_min, dist_y_max)
         return float('inf')
@@ -96,6 +103,18 @@ class ZoneManager:
         """Initialize zone manager with predefined zones from config."""
         self.zones = {}
         self.current_zone = None
+        self._cell_size = config.ZONE_GRID_CELL_SIZE
+        self._zone_tuple = ()  # zones in configuration order, for iteration
+        self._grid = {}  # (cell_x, cell_y) -> tuple of zones overlapping that cell
+        
+        # Structure-of-arrays zone bounds for vectorized containment tests
+        self._xmin = self._xmax = self._ymin = self._ymax = np.empty(0, dtype=np.float32)
+        
+        # Set when zones are disjoint x-strips sharing one y_range
+        self._x_edges = None  # sorted strip x_max values
+        self._zones_by_strip = None
+        self._strip_edges = None  # _x_edges as an array, for batched searchsorted
+        self._strip_zone_ids = None  # configuration index per strip, plus -1 past the last edge
         self._initialize_zones()
     
     def _initialize_zones(self):
@@ -111,9 +130,183 @@ class ZoneManager:
             )
             self.zones[zone_id] = zone
         
+        self._rebuild_indexes()
+        
         # Set initial zone
-        if self.zones:
-            self.current_zone = next(iter(self.zones.values()))
+        if self._zone_tuple:
+            self.current_zone = self._zone_tuple[0]
+    
+    def _rebuild_indexes(self):
+        """Rebuild the zone tuple and lookup indexes; call after mutating self.zones."""
+        self._zone_tuple = tuple(self.zones.values())
+        self._x_edges = self._zones_by_strip = None
+        self._strip_edges = self._strip_zone_ids = None
+        self._build_grid()
+        self._build_bounds()
+        self._build_strips()
+        self._build_specialized_lookup()
+    
+    def _build_grid(self):
+        """
+        Build a uniform grid index mapping each cell to the zones overlapping it.
+        
+        Zones keep their configuration order within a cell, so lookups resolve
+        shared boundaries the same way as a linear scan.
+        """
+        cell = self._cell_size
+        grid = {}
+        for zone in self._zone_tuple:
+            x_min, x_max = zone.x_range
+            y_min, y_max = zone.y_range
+            for cx in range(int(x_min // cell), int(x_max // cell) + 1):
+                for cy in range(int(y_min // cell), int(y_max // cell) + 1):
+                    grid.setdefault((cx, cy), []).append(zone)
+        self._grid = {key: tuple(zones) for key, zones in grid.items()}
+    
+    def _build_bounds(self):
+        """Build parallel float32 arrays of zone bounds in configuration order."""
+        zones = self._zone_tuple
+        self._xmin = np.array([z.x_min for z in zones], dtype=np.float32)
+        self._xmax = np.array([z.x_max for z in zones], dtype=np.float32)
+        self._ymin = np.array([z.y_min for z in zones], dtype=np.float32)
+        self._ymax = np.array([z.y_max for z in zones], dtype=np.float32)
+    
+    def _build_strips(self):
+        """
+        Detect the disjoint x-strip layout and precompute its edges.
+        
+        When every zone spans the same y_range and the x_ranges do not
+        overlap (touching edges are allowed), the containing zone is found
+        by a binary search over the strips' x_max values.
+        
+        A point on a shared edge resolves to the left strip, which matches
+        the linear scan only if configuration order is also left-to-right
+        x order; other orderings keep the generic lookup.
+        """
+        zones = self._zone_tuple
+        if not zones:
+            return
+        
+        y_range = zones[0].y_range
+        for prev, zone in zip(zones, zones[1:]):
+            if zone.y_range != y_range or zone.x_range[0] < prev.x_range[1]:
+                return
+        
+        self._x_edges = [zone.x_range[1] for zone in zones]
+        self._zones_by_strip = zones
+        
+        self._strip_edges = np.array(self._x_edges, dtype=np.float32)
+        self._strip_zone_ids = np.arange(len(zones) + 1, dtype=np.intp)
+        self._strip_zone_ids[-1] = -1
+    
+    def _build_specialized_lookup(self):
+        """
+        Generate a find_zone() with every zone's bounds inlined as literals.
+        
+        For small fixed layouts this replaces the index lookups with a chain
+        of constant comparisons in configuration order. Larger layouts keep
+        the generic find_zone().
+        """
+        self.__dict__.pop("find_zone", None)
+        zones = self._zone_tuple
+        if not zones or len(zones) > config.ZONE_CODEGEN_MAX_ZONES:
+            return
+        
+        lines = ["def find_zone(x, y):"]
+        for i, zone in enumerate(zones):
+            lines.append(
+                f"    if {float(zone.x_min)!r} <= x <= {float(zone.x_max)!r} "
+                f"and {float(zone.y_min)!r} <= y <= {float(zone.y_max)!r}:"
+            )
+            lines.append(f"        return Z{i}")
+        lines.append("    return None")
+        
+        namespace = {f"Z{i}": zone for i, zone in enumerate(zones)}
+        exec("\n".join(lines), namespace)
+        self.find_zone = namespace["find_zone"]
+    
+    def find_zones(self, xs, ys):
+        """
+        Find the zone index for many points in one vectorized pass.
+        
+        Args:
+            xs (array-like): X coordinates
+            ys (array-like): Y coordinates
+        
+        Returns:
+            np.ndarray: Index into configuration order per point, -1 if outside all zones
+        """
+        xs = np.asarray(xs, dtype=np.float32)[:, None]
+        ys = np.asarray(ys, dtype=np.float32)[:, None]
+        mask = (xs >= self._xmin) & (xs <= self._xmax) & (ys >= self._ymin) & (ys <= self._ymax)
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+    
+    def update_positions_batch(self, xs, ys):
+        """
+        Find the zone index for many vehicles with one binary search per array.
+        
+        Uses np.searchsorted over the strip edges when zones are disjoint
+        x-strips, and falls back to find_zones() otherwise. The current zone
+        is not changed.
+        
+        Args:
+            xs (array-like): Vehicle X coordinates
+            ys (array-like): Vehicle Y coordinates
+        
+        Returns:
+            np.ndarray: Index into configuration order per vehicle, -1 if outside all zones
+        """
+        if self._strip_edges is None:
+            return self.find_zones(xs, ys)
+        
+        xs = np.asarray(xs, dtype=np.float32)
+        ys = np.asarray(ys, dtype=np.float32)
+        ids = self._strip_zone_ids[np.searchsorted(self._strip_edges, xs, side="left")]
+        safe = np.maximum(ids, 0)
+        inside = (ids >= 0) & (xs >= self._xmin[safe]) & (ys >= self._ymin[safe]) & (ys <= self._ymax[safe])
+        return np.where(inside, ids, -1)
+    
+    def find_zone(self, x, y):
+        """
+        Find the zone containing a point.
+        
+        The lookup tier is fixed per layout by _rebuild_indexes(), in order:
+        
+        1. Up to ZONE_CODEGEN_MAX_ZONES zones: _build_specialized_lookup()
+           installs a generated find_zone() on the instance, shadowing this
+           method (the default configuration takes this path).
+        2. Larger layouts of disjoint x-strips: binary search over the strip
+           edges.
+        3. Any other larger layout, with Numba installed: the compiled
+           zone_lookup() scan over the bounds arrays.
+        4. Otherwise: the uniform grid index.
+        
+        update_position() checks the current zone before calling this.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+        
+        Returns:
+            Zone: Zone containing the point, or None if outside all zones
+        """
+        if self._x_edges is not None:
+            idx = bisect_left(self._x_edges, x)
+            if idx < len(self._x_edges):
+                zone = self._zones_by_strip[idx]
+                if zone.contains_point(x, y):
+                    return zone
+            return None
+        
+        if HAVE_NUMBA:
+            idx = zone_lookup(x, y, self._xmin, self._xmax, self._ymin, self._ymax)
+            return self._zone_tuple[idx] if idx >= 0 else None
+        
+        cell = self._cell_size
+        for zone in self._grid.get((int(x // cell), int(y // cell)), ()):
+            if zone.contains_point(x, y):
+                return zone
+        return None
     
     def update_position(self, x, y):
         """
@@ -127,13 +320,20 @@ class ZoneManager:
         Returns:
             Zone: Current zone object
         """
-        for zone in self.zones.values():
-            if zone.contains_point(x, y):
-                self.current_zone = zone
-                return zone
+        # The vehicle usually stays in the same zone between frames; the
+        # containment test is inlined to skip a method call on this path
+        current = self.current_zone
+        if (current is not None and current.x_min <= x <= current.x_max
+                and current.y_min <= y <= current.y_max):
+            return current
+        
+        zone = self.find_zone(x, y)
+        if zone is not None:
+            self.current_zone = zone
+            return zone
         
         # If no zone contains position, keep current zone
-        return self.current_zone
+        return current
     
     def get_speed_limit(self, x, y):
         """
@@ -201,16 +401,29 @@ class ZoneManager:
         Returns:
             dict: Current zone information
         """
-        if self.current_zone:
-            return {
-                "zone_id": self.current_zone.zone_id,
-                "zone_name": self.current_zone.name,
-                "speed_limit": self.current_zone.speed_limit,
-                "color": self.current_zone.color
-            }
-        return {
-            "zone_id": "unknown",
-            "zone_name": "Unknown",
-            "speed_limit": config.VEHICLE_MAX_SPEED,
-            "color": (1.0, 1.0, 1.0)
-        }
+        return self.fill_state({})
+    
+    def fill_state(self, out):
+        """
+        Write current zone state into an existing dictionary.
+        
+        Args:
+            out (dict): Dictionary to update in place
+        
+        Returns:
+            dict: The same dictionary, for chaining
+        """
+        zone = self.current_zone
+        if zone:
+            out["zone_id"] = zone.zone_id
+            out["zone_name"] = zone.name
+            out["speed_limit"] = zone.speed_limit
+            out["color"] = zone.color
+            out["color_rgba"] = zone.color_rgba
+        else:
+            out["zone_id"] = "unknown"
+            out["zone_name"] = "Unknown"
+            out["speed_limit"] = config.VEHICLE_MAX_SPEED
+            out["color"] = (1.0, 1.0, 1.0)
+            out["color_rgba"] = (1.0, 1.0, 1.0, 1.0)
+        return out
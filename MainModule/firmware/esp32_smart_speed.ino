@@ -23,6 +23,7 @@ MQTT TOPICS SUBSCRIBED:
 ======================
 - vehicle/smart_speed/state   → Current system state (NORMAL/WARNING/REGULATING)
 - vehicle/smart_speed/speed   → Speed and limit information
+- vehicle/smart_speed/telemetry → Combined location, speed and state
 
 LED BEHAVIOR:
 =============
@@ -110,6 +111,7 @@ const unsigned long SERIAL_UPDATE_INTERVAL = 1000;       // 1 second
 // MQTT Topics
 const char* topic_state = "vehicle/smart_speed/state";
 const char* topic_speed = "vehicle/smart_speed/speed";
+const char* topic_telemetry = "vehicle/smart_speed/telemetry";
 
 // ===========================
 // GLOBAL VARIABLES
@@ -144,6 +146,7 @@ void blink_yellow_led();
 void print_status();
 void parse_state_message(const char* payload, size_t length);
 void parse_speed_message(const char* payload, size_t length);
+void parse_telemetry_message(const char* payload, size_t length);
 
 // ===========================
 // SETUP FUNCTION
@@ -301,11 +304,14 @@ void reconnect_mqtt() {
     // Subscribe to topics
     boolean sub_state = client.subscribe(topic_state, 1);  // QoS 1
     boolean sub_speed = client.subscribe(topic_speed, 1);  // QoS 1
+    boolean sub_telemetry = client.subscribe(topic_telemetry, 1);  // QoS 1
     
     Serial.print("[MQTT] Subscribe state topic: ");
     Serial.println(sub_state ? "✅ SUCCESS" : "❌ FAILED");
     Serial.print("[MQTT] Subscribe speed topic: ");
     Serial.println(sub_speed ? "✅ SUCCESS" : "❌ FAILED");
+    Serial.print("[MQTT] Subscribe telemetry topic: ");
+    Serial.println(sub_telemetry ? "✅ SUCCESS" : "❌ FAILED");
     
     Serial.println("[MQTT] ✅ Ready to receive messages");
   } else {
@@ -367,6 +373,10 @@ void mqtt_callback(char* topic, byte* payload, unsigned int length) {
     Serial.println("[Parse] Processing SPEED message...");
     parse_speed_message((const char*)payload, length);
   }
+  else if (topic_str == topic_telemetry) {
+    Serial.println("[Parse] Processing TELEMETRY message...");
+    parse_telemetry_message((const char*)payload, length);
+  }
   else {
     Serial.print("[MQTT] ⚠️  WARNING: Unknown topic: ");
     Serial.println(topic_str);
@@ -422,6 +432,34 @@ void parse_speed_message(const char* payload, size_t length) {
   }
 }
 
+void parse_telemetry_message(const char* payload, size_t length) {
+  // JSON payload: {"loc": {...}, "speed": {"v", "limit", "over"}, "state": {"name", ...}, "ts": float}
+  
+  StaticJsonDocument<384> doc;
+  DeserializationError error = deserializeJson(doc, payload, length);
+  
+  if (error) {
+    Serial.print("[MQTT] JSON parse error: ");
+    Serial.println(error.c_str());
+    return;
+  }
+  
+  JsonObject state = doc["state"];
+  if (!state.isNull() && state.containsKey("name")) {
+    current_state = state["name"].as<String>();
+  }
+  
+  JsonObject speed = doc["speed"];
+  if (!speed.isNull()) {
+    if (speed.containsKey("v")) {
+      current_speed = speed["v"].as<float>();
+    }
+    if (speed.containsKey("limit")) {
+      speed_limit = speed["limit"].as<float>();
+    }
+  }
+}
+
 // ===========================
 // LED CONTROL FUNCTIONS
 // ===========================
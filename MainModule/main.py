@@ -28,7 +28,7 @@ Layer 2 - SPEED MONITORING & REGULATION ENGINE
 
 Layer 3 - MQTT IoT COMMUNICATION LAYER
     - Real-time telemetry publishing to HiveMQ broker
-    - Topics: location, speed, state (500ms interval)
+    - Combined telemetry topic: location, speed, state (500ms interval)
     - Automatic reconnection and clean session handling
     - Status monitoring on HUD
 
@@ -47,7 +47,7 @@ DATA FLOW:
 4. Control engine monitors speed vs limit
 5. System state determined (NORMAL/WARNING/REGULATING)
 6. If over limit: acceleration is reduced proportionally
-7. Telemetry published to MQTT topics (lat/lon, speed, state)
+7. Telemetry published to MQTT as one message (lat/lon, speed, state)
 8. ESP32 receives state updates via MQTT
 9. ESP32 controls LEDs based on system state
 10. HUD displays real-time information on screen
@@ -57,6 +57,8 @@ MQTT TOPICS:
 - vehicle/smart_speed/location  → {"lat": float, "lon": float}
 - vehicle/smart_speed/speed     → {"speed": float, "limit": float}
 - vehicle/smart_speed/state     → {"state": "NORMAL|WARNING|REGULATING"}
+- vehicle/smart_speed/telemetry → {"loc": {"lat", "lon"}, "speed": {"v", "limit", "over"},
+                                   "state": {"name", "color"}, "ts": float}
 
 VEHICLE ZONES:
 ==============
@@ -114,6 +116,8 @@ LICENSE: MIT
 
 import sys
 import time
+import logging
+import threading
 import config
 from panda3d.core import Point3, Vec3, VBase4, AmbientLight, DirectionalLight
 from panda3d.core import TextNode, LineSegs, CardMaker, Texture, WindowProperties
@@ -126,9 +130,31 @@ from core.vehicle import Vehicle
 from core.zone_manager import ZoneManager
 from core.control_engine import ControlEngine
 from core.mqtt_client import SmartSpeedMQTTClient
+from core._physics_kernels import camera_offset, warmup
 from ui.hud import HUD
 from ui.audio_manager import AudioManager
 
+logger = logging.getLogger(__name__)
+
+
+def _log_task_errors(task_func):
+    """
+    Wrap a per-frame task so an exception is logged and the task keeps running.
+    
+    Args:
+        task_func (callable): Task function taking the Panda3D task
+    
+    Returns:
+        callable: Wrapped task function
+    """
+    def wrapper(task):
+        try:
+            return task_func(task)
+        except Exception:
+            logger.exception("[Update] Error in %s", task_func.__name__)
+            return Task.cont  # Continue despite error
+    return wrapper
+
 
 class SmartSpeedSimulation(ShowBase):
     """
@@ -136,6 +162,10 @@ class SmartSpeedSimulation(ShowBase):
     Extends Panda3D ShowBase with custom simulation logic.
     """
     
+    # Camera follow offsets as floats for the compiled camera_offset kernel
+    _CAMERA_DISTANCE = float(config.CAMERA_DISTANCE)
+    _CAMERA_HEIGHT = float(config.CAMERA_HEIGHT)
+    
     def __init__(self):
         """Initialize the Smart Speed Simulation."""
         ShowBase.__init__(self)
@@ -160,6 +190,9 @@ class SmartSpeedSimulation(ShowBase):
         props.setForeground(True)
         self.win.requestProperties(props)
         
+        # Compile the numeric kernels up front instead of on the first frames
+        warmup()
+        
         # Initialize core systems
         self.physics_engine = VehiclePhysics()
         self.vehicle = Vehicle(self.physics_engine)
@@ -171,9 +204,28 @@ class SmartSpeedSimulation(ShowBase):
         
         # Game state
         self.running = True
-        self.last_mqtt_publish = 0
+        self._clock = self.clock  # Global ClockObject, read twice per frame
+        self._next_mqtt_deadline = 0.0  # Frame time of the next telemetry publish
+        self._state_changed = True  # Retain the first telemetry and every state transition
+        self.speed_limit = config.VEHICLE_MAX_SPEED  # Limit of the current zone, set each frame
+        self._last_control_state = self.control_engine.get_current_state()  # Refreshed each frame
+        
+        # Per-frame HUD inputs, filled in place by _update_task. "position" is
+        # the tuple returned by Vehicle.update(); the per-frame paths read it
+        # instead of building a new tuple through Vehicle.position
+        self._vehicle_state = {"position": self.vehicle.position, "velocity": 0.0}
+        self._zone_info = self.zone_manager.get_current_state()
+        self._mqtt_status = self.mqtt_client.get_status()
         self.fps_timer = 0
         
+        # Single-slot hand-off to the MQTT publisher thread (newest snapshot wins)
+        self._tx_slot = None
+        self._tx_lock = threading.Lock()
+        self._tx_cv = threading.Condition(self._tx_lock)
+        self._tx_thread = threading.Thread(target=self._mqtt_worker, name="mqtt-publisher", daemon=True)
+        self._last_tx = None  # (x, y, speed, limit, state) of the last hand-off
+        self._next_tx_heartbeat = 0.0
+        
         # Vehicle input state
         self.key_up = False
         self.key_down = False
@@ -187,7 +239,7 @@ class SmartSpeedSimulation(ShowBase):
         self._setup_input()
         
         # Register update task
-        self.taskMgr.add(self._update_task, "SimulationUpdate")
+        self.taskMgr.add(_log_task_errors(self._update_task), "SimulationUpdate")
         
         # Configure camera
         self._setup_camera()
@@ -195,6 +247,7 @@ class SmartSpeedSimulation(ShowBase):
         # Connect MQTT
         print("[Main] Connecting to MQTT broker...")
         self.mqtt_client.connect()
+        self._tx_thread.start()
         
         # Register state change callback
         self.control_engine.add_state_callback(self._on_control_state_change)
@@ -323,119 +376,164 @@ class SmartSpeedSimulation(ShowBase):
     def _reset_vehicle(self):
         """Reset vehicle to initial position."""
         self.vehicle.reset()
+        self._vehicle_state["position"] = self.vehicle.position
         print("[Main] Vehicle reset")
     
     def _update_task(self, task):
         """Main simulation update task (called every frame)."""
-        try:
-            dt = globalClock.getDt()  # Delta time since last frame
-            
-            # Calculate input values
-            acceleration = 0.0
-            steering = 0.0
-            braking = False
-            
-            if self.key_up:
-                acceleration = 1.0
-            elif self.key_down:
-                braking = True
-            
-            if self.key_left:
-                steering = -1.0
-            elif self.key_right:
-                steering = 1.0
-            
-            # Update zone based on vehicle position
-            x, y, z = self.vehicle.position
-            self.zone_manager.update_position(x, y)
-            speed_limit = self.zone_manager.get_speed_limit(x, y)
-            
-            # Get acceleration multiplier from control engine
-            accel_multiplier = self.control_engine.get_acceleration_multiplier()
-            
-            # Update vehicle
-            velocity, position = self.vehicle.update(
-                dt, acceleration, steering, braking, accel_multiplier
+        clock = self._clock
+        dt = clock.getDt()  # Delta time since last frame
+        
+        # Calculate input values
+        acceleration = 0.0
+        steering = 0.0
+        braking = False
+        
+        if self.key_up:
+            acceleration = 1.0
+        elif self.key_down:
+            braking = True
+        
+        if self.key_left:
+            steering = -1.0
+        elif self.key_right:
+            steering = 1.0
+        
+        # Update zone based on vehicle position (as of the last update)
+        x, y, z = self._vehicle_state["position"]
+        zone = self.zone_manager.update_position(x, y)
+        speed_limit = zone.speed_limit if zone else config.VEHICLE_MAX_SPEED
+        self.speed_limit = speed_limit  # Reused by _publish_telemetry
+        
+        # Get acceleration multiplier from control engine
+        accel_multiplier = self.control_engine.get_acceleration_multiplier()
+        
+        # Update vehicle
+        velocity, position = self.vehicle.update(
+            dt, acceleration, steering, braking, accel_multiplier
+        )
+        
+        # Update control engine
+        self.control_engine.update(velocity, speed_limit)
+        
+        # Update control engine state (reused by _publish_telemetry)
+        control_state = self.control_engine.get_current_state()
+        self._last_control_state = control_state
+        
+        # Update 3D node position
+        self.vehicle.update_3d_representation(position)
+        
+        # Update camera to follow vehicle
+        self._update_camera(position)
+        
+        # Update HUD (state dicts are reused and refreshed in place)
+        vehicle_state = self._vehicle_state
+        vehicle_state["position"] = position
+        vehicle_state["velocity"] = velocity
+        zone_info = self.zone_manager.fill_state(self._zone_info)
+        mqtt_status = self.mqtt_client.fill_status(self._mqtt_status)
+        
+        self.hud.update(vehicle_state, zone_info, control_state, mqtt_status, dt)
+        
+        # Publish MQTT telemetry
+        now = clock.getFrameTime()
+        if now >= self._next_mqtt_deadline:
+            self._publish_telemetry(now)
+            self._next_mqtt_deadline = now + config.MQTT_PUBLISH_INTERVAL
+        
+        return Task.cont
+    
+    def _update_camera(self, position):
+        """
+        Update camera position to follow vehicle.
+        
+        Args:
+            position (tuple): Vehicle position (x, y, z) from this frame's update
+        """
+        vehicle = self.vehicle
+        vx, vy, vz = position
+        
+        # Position camera behind and above vehicle (heading sin/cos cached by Vehicle)
+        cam_x, cam_y, cam_z = camera_offset(
+            vx, vy, vz, vehicle._heading_sin, vehicle._heading_cos,
+            self._CAMERA_DISTANCE, self._CAMERA_HEIGHT
+        )
+        
+        self.camera.setPos(cam_x, cam_y, cam_z)
+        self.camera.lookAt(vx, vy, vz + 2)
+    
+    def _publish_telemetry(self, now):
+        """
+        Hand the latest telemetry snapshot to the MQTT publisher thread.
+        
+        Args:
+            now (float): Current frame time in seconds
+        """
+        x, y, z = self._vehicle_state["position"]
+        control_state = self._last_control_state
+        
+        # Parked and unchanged: don't wake the publisher until the heartbeat is due
+        # (the client applies the finer TELEMETRY_DELTA_* thresholds itself)
+        snapshot = (x, y, self.vehicle.velocity, self.speed_limit, control_state["state_id"])
+        if not self._state_changed and snapshot == self._last_tx and now < self._next_tx_heartbeat:
+            return
+        self._last_tx = snapshot
+        self._next_tx_heartbeat = now + config.TELEMETRY_HEARTBEAT_INTERVAL
+        
+        with self._tx_cv:
+            # Keep a pending state transition retained if its snapshot is superseded
+            retain = self._state_changed or (self._tx_slot is not None and self._tx_slot[-1])
+            self._tx_slot = (
+                x / 1000.0, y / 1000.0, self.vehicle.velocity, self.speed_limit,
+                control_state["state_id"], control_state["color"], self.vehicle.heading, retain
             )
+            self._tx_cv.notify()
+        self._state_changed = False
+    
+    def _mqtt_worker(self):
+        """Publisher thread: drain the telemetry slot and publish off the render loop."""
+        while True:
+            with self._tx_cv:
+                while self._tx_slot is None and self.running:
+                    self._tx_cv.wait()
+                if not self.running:
+                    return
+                lat, lon, speed, speed_limit, state, state_color, heading, retain = self._tx_slot
+                self._tx_slot = None
             
-            # Update control engine
-            self.control_engine.update(velocity, speed_limit)
-            
-            # Update control engine state
-            control_state = self.control_engine.get_current_state()
-            
-            # Update 3D node position
-            self.vehicle.update_3d_representation()
-            
-            # Update camera to follow vehicle
-            self._update_camera()
+            if not self.mqtt_client.is_connected():
+                logger.debug("[MQTT] Not connected, buffering latest telemetry")
             
-            # Update HUD
-            vehicle_state = {"position": position, "velocity": velocity}
-            zone_info = self.zone_manager.get_current_state()
-            mqtt_status = self.mqtt_client.get_status()
+            # Publish location, speed and state as one combined message
+            result = self.mqtt_client.publish_telemetry(
+                lat, lon, speed, speed_limit, state, state_color,
+                heading=heading, retain=retain
+            )
             
-            self.hud.update(vehicle_state, zone_info, control_state, mqtt_status, dt)
+            if config.MQTT_PUBLISH_LEGACY_TOPICS and self.mqtt_client.is_connected():
+                self.mqtt_client.publish_location(lat, lon)
+                self.mqtt_client.publish_speed(speed, speed_limit)
+                self.mqtt_client.publish_state(state.name, state_color, retain=retain)
             
-            # Publish MQTT telemetry
-            current_time = time.time()
-            if current_time - self.last_mqtt_publish >= config.MQTT_PUBLISH_INTERVAL:
-                self._publish_telemetry()
-                self.last_mqtt_publish = current_time  # Update timestamp AFTER completed publishes
+            logger.debug("[MQTT] Telemetry published: %s (lat: %.4f, lon: %.4f, "
+                         "speed: %.1f km/h, limit: %.0f km/h, state: %s)",
+                         result, lat, lon, speed, speed_limit, state.name)
             
-            return Task.cont
-        
-        except Exception as e:
-            print(f"[Update] Error in game loop: {e}")
-            import traceback
-            traceback.print_exc()
-            return Task.cont  # Continue despite error
-    
-    def _update_camera(self):
-        """Update camera position to follow vehicle."""
-        vx, vy, vz = self.vehicle.position
-        heading_rad = __import__('math').radians(self.vehicle.heading)
-        
-        # Position camera behind and above vehicle
-        cam_x = vx - config.CAMERA_DISTANCE * __import__('math').cos(heading_rad)
-        cam_y = vy - config.CAMERA_DISTANCE * __import__('math').sin(heading_rad)
-        cam_z = vz + config.CAMERA_HEIGHT
-        
-        self.camera.setPos(cam_x, cam_y, cam_z)
-        self.camera.lookAt(vx, vy, vz + 2)
+            if not result and self.mqtt_client.is_connected():
+                logger.warning("[MQTT] Telemetry publish failed")
     
-    def _publish_telemetry(self):
-        """Publish vehicle telemetry via MQTT."""
-        if not self.mqtt_client.is_connected():
-            print("[MQTT] ⚠️  Not connected, skipping publish")
-            return
-        
-        x, y, z = self.vehicle.position
-        speed = self.vehicle.velocity
-        state = self.control_engine.current_state
-        state_color = self.control_engine.get_current_state()["color"]
-        
-        # Publish location (simulated GPS)
-        loc_result = self.mqtt_client.publish_location(x / 1000.0, y / 1000.0)
-        print(f"[MQTT] [1] Location published: {loc_result} (lat: {x/1000.0:.4f}, lon: {y/1000.0:.4f})")
-        
-        # Publish speed
-        speed_limit = self.zone_manager.get_speed_limit(x, y)
-        speed_result = self.mqtt_client.publish_speed(speed, speed_limit)
-        print(f"[MQTT] [2] Speed published: {speed_result} (speed: {speed:.1f} km/h, limit: {speed_limit:.0f} km/h)")
-        
-        # Publish state
-        state_result = self.mqtt_client.publish_state(state, state_color)
-        print(f"[MQTT] [3]  State published: {state_result} (state: {state})")
-        
-        # Summary
-        if loc_result and speed_result and state_result:
-            print(f"[MQTT] ✅ All telemetry published successfully\n")
-        else:
-            print(f"[MQTT] ⚠️  Some publishes failed!\n")
+    def _stop_mqtt_worker(self):
+        """Stop the MQTT publisher thread."""
+        with self._tx_cv:
+            self.running = False
+            self._tx_cv.notify()
+        if self._tx_thread.is_alive():
+            self._tx_thread.join(timeout=1.0)
     
     def _on_control_state_change(self, old_state, new_state, speed, limit):
         """Callback when control state changes."""
+        self._state_changed = True
+        
         if new_state == config.SPEED_STATE_WARNING:
             print(f"[Control] ⚠️  WARNING: Speed {speed:.1f} exceeds limit {limit:.0f}!")
             self.audio_manager.play_warning_sound()
@@ -451,6 +549,7 @@ class SmartSpeedSimulation(ShowBase):
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
     try:
         sim = SmartSpeedSimulation()
         sim.run()
@@ -463,6 +562,7 @@ def main():
     finally:
         print("[Main] Cleaning up...")
         if 'sim' in locals():
+            sim._stop_mqtt_worker()
             sim.mqtt_client.disconnect()
         print("[Main] Goodbye!\n")
 
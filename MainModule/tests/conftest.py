@@ -0,0 +1,9 @@
+"""
+Pytest configuration: make the MainModule packages importable as the
+application does (``import config``, ``from core...``, ``from ui...``).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
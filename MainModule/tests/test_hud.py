@@ -0,0 +1,44 @@
+"""
+Tests for the HUD text formatting and frame-rate average.
+"""
+
+from ui import hud as hud_module
+from ui.hud import _gps_text
+
+
+def test_gps_text_rounds_negative_fractional_coordinates():
+    assert _gps_text(1234.5678, -12.3456) == "GPS: (1.234568, -0.012346)"
+
+
+def test_gps_text_origin():
+    assert _gps_text(0.0, 0.0) == "GPS: (0.000000, 0.000000)"
+
+
+class _FakeNodePath:
+    def attachNewNode(self, name):
+        return _FakeNodePath()
+
+    def flattenStrong(self):
+        pass
+
+
+class _FakeBase:
+    render2d = _FakeNodePath()
+    win = None  # Window closed: update() stops after the FPS average
+
+
+def _make_hud(monkeypatch):
+    monkeypatch.setattr(hud_module, "TextNode", None)  # No Panda3D: elements are created as None
+    return hud_module.HUD(_FakeBase())
+
+
+def test_fps_average_ignores_zero_dt(monkeypatch):
+    hud = _make_hud(monkeypatch)
+    hud.update({}, {}, {}, {}, 0.0)
+    assert hud._fps_ema == 60.0
+
+
+def test_fps_average_caps_near_zero_dt(monkeypatch):
+    hud = _make_hud(monkeypatch)
+    hud.update({}, {}, {}, {}, 1e-9)
+    assert hud._fps_ema <= 0.9 * 60.0 + 0.1 * 1000.0
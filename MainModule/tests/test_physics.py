@@ -0,0 +1,51 @@
+"""
+Tests for the vehicle physics engine.
+"""
+
+import pytest
+
+from core import _physics_kernels
+from core._physics_kernels import step, warmup
+from core.physics import VehiclePhysics
+
+
+@pytest.mark.skipif(not _physics_kernels.HAVE_NUMBA, reason="numba not installed")
+def test_step_kernel_specialized_once():
+    """Every input mode reuses the float signature compiled by warmup()."""
+    warmup()
+    physics = VehiclePhysics()
+
+    for acceleration, steering, braking in ((1, 0, False), (0, 1, True), (-1, -1, False), (0, 0, False)):
+        physics.set_inputs(acceleration, steering, braking)
+        physics.update(0.016, max_speed_limit=50)
+
+    assert len(step.signatures) == 1
+
+
+def test_brake_decelerates():
+    physics = VehiclePhysics()
+    physics.velocity = 50.0
+    physics.set_inputs(0.0, 0.0, True)
+
+    velocity, _ = physics.update(0.016)
+
+    assert velocity == pytest.approx(50.0 - VehiclePhysics._DECEL_BRAKE * 0.016)
+
+
+def test_position_tuple_reused_at_rest():
+    physics = VehiclePhysics()
+    _, first = physics.update(0.016)
+    _, second = physics.update(0.016)
+    assert second is first
+
+    physics.set_inputs(1.0, 0.0, False)
+    _, moved = physics.update(0.1)
+    assert moved is not first
+    assert moved == tuple(physics.position.tolist())
+
+
+def test_set_position_refreshes_position_tuple():
+    physics = VehiclePhysics()
+    physics.set_position(10.0, -5.0)
+    _, position = physics.update(0.016)
+    assert position == (10.0, -5.0, 0.0)
@@ -0,0 +1,47 @@
+"""
+Tests for the vehicle's 3D node updates.
+"""
+
+from core.physics import VehiclePhysics
+from core.vehicle import Vehicle
+
+
+class _FakeNode:
+    def __init__(self):
+        self.calls = []
+
+    def setPosHpr(self, *args):
+        self.calls.append(args)
+
+
+def _make_vehicle():
+    vehicle = Vehicle(VehiclePhysics())
+    vehicle.set_3d_node(_FakeNode())
+    return vehicle
+
+
+def test_parked_vehicle_skips_transform_update():
+    vehicle = _make_vehicle()
+    for _ in range(3):
+        _, position = vehicle.update(0.016, 0.0, 0.0, False)
+        vehicle.update_3d_representation(position)
+    assert len(vehicle.node.calls) == 1
+
+
+def test_moving_vehicle_updates_transform():
+    vehicle = _make_vehicle()
+    _, position = vehicle.update(0.1, 1.0, 1.0, False)
+    vehicle.update_3d_representation(position)
+    _, position = vehicle.update(0.1, 1.0, 1.0, False)
+    vehicle.update_3d_representation(position)
+    x, y, z = position
+    assert vehicle.node.calls[-1] == (x, y, z, vehicle.heading, 0, 0)
+    assert len(vehicle.node.calls) == 2
+
+
+def test_set_position_moves_node():
+    vehicle = _make_vehicle()
+    vehicle.update_3d_representation()
+    vehicle.set_position(5.0, 6.0)
+    vehicle.update_3d_representation()
+    assert vehicle.node.calls[-1][:3] == (5.0, 6.0, 0.0)
@@ -0,0 +1,118 @@
+"""
+Tests for zone lookup. Each find_zone() tier must agree with a linear scan
+over the zones in configuration order.
+"""
+
+import random
+
+import pytest
+
+import config
+from core import _physics_kernels, zone_manager
+from core.zone_manager import ZoneManager
+
+
+def _zone(name, x_range, y_range):
+    return {
+        "name": name,
+        "speed_limit": 50,
+        "color": (1.0, 1.0, 1.0),
+        "x_range": x_range,
+        "y_range": y_range,
+    }
+
+
+# Ten touching x-strips sharing one y_range
+STRIPS = {"s%d" % i: _zone("Strip %d" % i, (i * 100, (i + 1) * 100), (-50, 50)) for i in range(10)}
+
+# The same strips configured right-to-left, so shared edges resolve to the
+# right-hand strip in a linear scan
+STRIPS_REVERSED = dict(reversed(list(STRIPS.items())))
+
+# Ten zones that do not form strips (different y_ranges, one overlap)
+MIXED = {"m%d" % i: _zone("Mixed %d" % i, (i * 80, i * 80 + 120), (i * 30, i * 30 + 90)) for i in range(10)}
+
+
+def _linear_scan(manager, x, y):
+    for zone in manager.zones.values():
+        if zone.contains_point(x, y):
+            return zone
+    return None
+
+
+def _make_manager(monkeypatch, zones, codegen_max):
+    monkeypatch.setattr(config, "ZONES", zones)
+    monkeypatch.setattr(config, "ZONE_CODEGEN_MAX_ZONES", codegen_max)
+    return ZoneManager()
+
+
+def _assert_matches_linear_scan(manager):
+    rng = random.Random(0)
+    points = [(rng.uniform(-200, 1200), rng.uniform(-100, 400)) for _ in range(2000)]
+    # Shared edges resolve to the first zone in configuration order
+    points += [(0.0, 0.0), (100.0, 0.0), (200.0, -50.0), (1000.0, 50.0), (80.0, 30.0)]
+    for x, y in points:
+        assert manager.find_zone(x, y) is _linear_scan(manager, x, y), (x, y)
+
+
+def test_default_zones_use_generated_lookup():
+    manager = ZoneManager()
+    assert "find_zone" in manager.__dict__
+    _assert_matches_linear_scan(manager)
+
+
+@pytest.mark.parametrize("zones", [STRIPS, MIXED], ids=["strips", "mixed"])
+def test_generated_lookup(monkeypatch, zones):
+    manager = _make_manager(monkeypatch, zones, codegen_max=len(zones))
+    assert "find_zone" in manager.__dict__
+    _assert_matches_linear_scan(manager)
+
+
+def test_strip_lookup(monkeypatch):
+    manager = _make_manager(monkeypatch, STRIPS, codegen_max=8)
+    assert "find_zone" not in manager.__dict__
+    assert manager._x_edges is not None
+    _assert_matches_linear_scan(manager)
+
+
+def test_strips_out_of_configuration_order_skip_strip_lookup(monkeypatch):
+    manager = _make_manager(monkeypatch, STRIPS_REVERSED, codegen_max=8)
+    assert manager._x_edges is None
+    assert manager.find_zone(100.0, 0.0).zone_id == "s1"
+    _assert_matches_linear_scan(manager)
+
+
+@pytest.mark.skipif(not _physics_kernels.HAVE_NUMBA, reason="numba not installed")
+def test_compiled_scan_lookup(monkeypatch):
+    manager = _make_manager(monkeypatch, MIXED, codegen_max=8)
+    assert "find_zone" not in manager.__dict__
+    assert manager._x_edges is None
+    _assert_matches_linear_scan(manager)
+    assert len(_physics_kernels.zone_lookup.signatures) == 1
+
+
+def test_grid_lookup(monkeypatch):
+    monkeypatch.setattr(zone_manager, "HAVE_NUMBA", False)
+    manager = _make_manager(monkeypatch, MIXED, codegen_max=8)
+    assert "find_zone" not in manager.__dict__
+    assert manager._x_edges is None
+    _assert_matches_linear_scan(manager)
+
+
+def test_update_position_keeps_zone_outside_all_zones():
+    manager = ZoneManager()
+    zone = manager.update_position(50.0, 0.0)
+    assert zone.zone_id == "city"
+    assert manager.update_position(5000.0, 5000.0) is zone
+
+
+@pytest.mark.parametrize("zones", [STRIPS, STRIPS_REVERSED], ids=["strips", "reversed"])
+def test_batch_lookup_matches_find_zone(monkeypatch, zones):
+    manager = _make_manager(monkeypatch, zones, codegen_max=8)
+    zone_ids = list(manager.zones)
+    xs = [-10.0, 0.0, 100.0, 150.0, 500.0, 999.0, 1000.0, 1001.0]
+    ys = [0.0, 0.0, 0.0, 60.0, 0.0, -50.0, 50.0, 0.0]
+    ids = manager.update_positions_batch(xs, ys)
+    for x, y, idx in zip(xs, ys, ids):
+        expected = _linear_scan(manager, x, y)
+        assert (idx == -1) if expected is None else (zone_ids[idx] == expected.zone_id), (x, y)
@@ -3,14 +3,34 @@ Smart Speed Control System - Audio Manager Module
 ================================================
 
 Handles non-blocking audio playback for warning and regulation sounds.
-Uses Panda3D audio capabilities for sound effects.
+Uses Panda3D audio capabilities for sound effects. Beeps are synthesized
+once at startup and preloaded, and playback requests are handed to a
+background thread so the render loop never waits on the audio device.
 
 Author: IoT Development Team
 Version: 1.0
 """
 
+import os
+import queue
+import tempfile
+import threading
+import wave
+import numpy as np
 import config
 
+SAMPLE_RATE = 44100  # Hz, 16-bit mono
+
+# One period of a sine wave; beeps index into it instead of calling sin per sample
+LUT_SIZE = 4096  # power of two, so the phase wraps with a bit mask
+SINE_LUT = np.sin(np.linspace(0, 2 * np.pi, LUT_SIZE, endpoint=False)).astype(np.float32)
+
+ENVELOPE_TIME = 0.005  # seconds of linear attack/release, avoids clicks at the edges
+
+# Beep sequences as (frequency Hz, duration s, volume 0-1)
+WARNING_TONES = ((1000, 0.2, 0.5),)
+REGULATING_TONES = ((800, 0.3, 0.7), (1000, 0.3, 0.7))
+
 
 class AudioManager:
     """
@@ -35,6 +55,8 @@ class AudioManager:
         self.warning_sound = None
         self.regulating_sound = None
         self.current_playing = None
+        self._queue = queue.Queue(maxsize=config.AUDIO_QUEUE_SIZE)
+        self._worker_thread = None
         self._load_sounds()
     
     def _load_sounds(self):
@@ -43,74 +65,130 @@ class AudioManager:
             return
         
         try:
-            # Create synthetic warning sound if file not available
-            # In production, you would load actual sound files
-            pass
+            self.warning_sound = self._load_sound(config.WARNING_SOUND_FILE, WARNING_TONES)
+            self.regulating_sound = self._load_sound(config.REGULATING_SOUND_FILE, REGULATING_TONES)
+            self._worker_thread = threading.Thread(target=self._worker, name="audio", daemon=True)
+            self._worker_thread.start()
         except Exception as e:
             print(f"[Audio] Warning: Could not load sounds: {e}")
             self.enabled = False
     
+    def _load_sound(self, filename, tones):
+        """
+        Load a sound file, synthesizing it first if it does not exist.
+        
+        Args:
+            filename (str): Sound file to load
+            tones (tuple): (frequency, duration, volume) beeps to synthesize
+        
+        Returns:
+            AudioSound: Preloaded sound
+        """
+        from panda3d.core import Filename
+        
+        path = filename
+        if not os.path.exists(path):
+            path = os.path.join(tempfile.gettempdir(), "smart_speed_" + os.path.basename(filename))
+            samples = np.concatenate([self._beep(*tone) for tone in tones])
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(SAMPLE_RATE)
+                wav.writeframes(samples.tobytes())
+        return self.base.loader.loadSfx(Filename.fromOsSpecific(path))
+    
+    def _post(self, request):
+        """
+        Queue a playback request for the audio thread without blocking.
+        
+        Args:
+            request (str): "warning", "regulating" or "stop"
+        """
+        if self._worker_thread is None:
+            return
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            # Rapid state oscillation: drop the oldest request, the newest one wins
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(request)
+            except queue.Full:
+                pass
+    
+    def _worker(self):
+        """Audio thread: play or stop the preloaded sounds as requests arrive."""
+        while True:
+            request = self._queue.get()
+            try:
+                if request == "warning":
+                    self.warning_sound.play()
+                elif request == "regulating":
+                    self.regulating_sound.play()
+                else:
+                    self.warning_sound.stop()
+                    self.regulating_sound.stop()
+            except Exception as e:
+                print(f"[Audio] Error handling '{request}' request: {e}")
+    
     def play_warning_sound(self):
         """
         Play warning sound (non-blocking).
-        Triggered when speed enters WARNING state.
+        Triggered when speed enters WARNING state; ignored while already playing.
         """
-        if not self.enabled:
+        if not self.enabled or self.current_playing == "warning":
             return
         
-        try:
-            # Generate beep sound effect
-            self._beep(frequency=1000, duration=0.2, volume=0.5)
-            self.current_playing = "warning"
-        except Exception as e:
-            print(f"[Audio] Error playing warning sound: {e}")
+        self._post("warning")
+        self.current_playing = "warning"
     
     def play_regulating_sound(self):
         """
         Play regulating sound (non-blocking).
-        Triggered when speed enters REGULATING state.
+        Triggered when speed enters REGULATING state; ignored while already playing.
         """
-        if not self.enabled:
+        if not self.enabled or self.current_playing == "regulating":
             return
         
-        try:
-            # Generate alarm sound effect
-            self._beep(frequency=800, duration=0.3, volume=0.7)
-            self._beep(frequency=1000, duration=0.3, volume=0.7)
-            self.current_playing = "regulating"
-        except Exception as e:
-            print(f"[Audio] Error playing regulating sound: {e}")
+        # Two-tone alarm, pre-rendered as a single sample
+        self._post("regulating")
+        self.current_playing = "regulating"
     
     def _beep(self, frequency=1000, duration=0.1, volume=0.5):
         """
-        Generate a simple beep sound.
+        Generate a simple beep waveform.
         
         Args:
             frequency (int): Frequency in Hz
             duration (float): Duration in seconds
             volume (float): Volume 0-1
+        
+        Returns:
+            np.ndarray: 16-bit PCM samples at SAMPLE_RATE
         """
-        if self.base and hasattr(self.base, 'sfxManagerFactory'):
-            try:
-                # This is a placeholder - actual implementation would use
-                # Panda3D's audio system or external audio library
-                pass
-            except Exception as e:
-                pass
+        n_samples = int(SAMPLE_RATE * duration)
+        step = frequency * LUT_SIZE / SAMPLE_RATE  # table entries per sample
+        idx = (np.arange(n_samples, dtype=np.float32) * step).astype(np.int32) & (LUT_SIZE - 1)
+        buf = SINE_LUT[idx] * np.float32(volume * 32767)
+        
+        # Linear fade in/out
+        ramp = min(int(SAMPLE_RATE * ENVELOPE_TIME), n_samples // 2)
+        if ramp:
+            fade = np.linspace(0.0, 1.0, ramp, dtype=np.float32)
+            buf[:ramp] *= fade
+            buf[-ramp:] *= fade[::-1]
+        return buf.astype(np.int16)
     
     def stop_sound(self):
         """Stop currently playing sound."""
         if not self.enabled:
             return
         
-        try:
-            if self.warning_sound:
-                self.warning_sound.stop()
-            if self.regulating_sound:
-                self.regulating_sound.stop()
-            self.current_playing = None
-        except Exception as e:
-            print(f"[Audio] Error stopping sound: {e}")
+        self._post("stop")
+        self.current_playing = None
     
     def set_enabled(self, enabled):
         """
@@ -120,6 +198,9 @@ class AudioManager:
             enabled (bool): Whether audio should be enabled
         """
         self.enabled = enabled and config.ENABLE_AUDIO
+        if not self.enabled and self.current_playing:
+            self._post("stop")
+            self.current_playing = None
     
     def get_status(self):
         """
@@ -18,6 +18,39 @@ Version: 1.0
 
 import config
 
+try:
+    from panda3d.core import TextNode, TextProperties, TextPropertiesManager
+except Exception:  # Panda3D unavailable: HUD elements are created as None
+    TextNode = TextProperties = TextPropertiesManager = None
+
+# HUD colors (RGBA), shared so unchanged colors compare as the same object
+CYAN = (0.0, 1.0, 1.0, 1.0)
+GREEN = (0.0, 1.0, 0.0, 1.0)
+WHITE = (1.0, 1.0, 1.0, 1.0)
+YELLOW = (1.0, 1.0, 0.0, 1.0)
+ORANGE = (1.0, 0.5, 0.0, 1.0)
+RED = (1.0, 0.0, 0.0, 1.0)
+LIGHT_GRAY = (0.8, 0.8, 0.8, 1.0)
+GRAY = (0.7, 0.7, 0.7, 1.0)
+
+
+def _gps_text(x, y):
+    """
+    Format the simulated GPS row for a world position.
+    
+    Args:
+        x (float): World X coordinate
+        y (float): World Y coordinate
+    
+    Returns:
+        str: GPS text, position / 1000 shown to 6 decimals
+    """
+    return "GPS: (%.6f, %.6f)" % (x / 1000.0, y / 1000.0)
+
+
+def _noop_updater(text, color=None):
+    """Updater for elements that could not be created."""
+
 
 class HUD:
     """
@@ -25,9 +58,8 @@ class HUD:
     
     Attributes:
         base (ShowBase): Panda3D ShowBase instance
-        text_elements (dict): Dictionary of text display elements
+        text_elements (dict): Element name -> (NodePath, TextNode), or None if creation failed
         update_interval (float): Time between HUD updates
-        last_update (float): Time of last update
     """
     
     def __init__(self, base):
@@ -39,119 +71,57 @@ class HUD:
         """
         self.base = base
         self.text_elements = {}
+        self._static_elements = {}  # name -> NodePath of generated text geometry; flattened, never updated
+        self._text_cache = {}  # name -> [text, color] last applied to the TextNode
+        self._last_quant = {}  # name -> quantized value the row was last formatted from
+        self._last_inputs = None  # Raw HUD inputs seen by the last update
+        self._rows = {}  # row name -> [text, color, scale, column]
+        self._columns = {}  # column name -> row names, top to bottom
+        self._dirty_columns = set()  # columns whose rows changed since the last render
+        self._properties = {}  # (color, scale) -> registered TextProperties name
         self.update_interval = config.HUD_UPDATE_INTERVAL
-        self.last_update = 0
+        self._accum = self.update_interval  # Time since last refresh; first update() draws
+        self._fps_ema = 60.0  # Smoothed frame rate from per-frame dt
         self._create_text_elements()
+        self._updaters = self._build_updaters()  # name -> updater(text, color)
     
     def _create_text_elements(self):
         """Create all HUD text elements and position them on screen."""
-        # Title
-        self._create_text_element(
-            "title",
-            "SMART SPEED CONTROL SYSTEM",
-            x=0.05,
-            y=0.95,
-            scale=0.08,
-            color=(0.0, 1.0, 1.0, 1)  # Cyan
-        )
-        
-        # Speed display (large, prominent)
-        self._create_text_element(
-            "speed",
-            "Speed: 0 km/h",
-            x=0.05,
-            y=0.85,
-            scale=0.07,
-            color=(0.0, 1.0, 0.0, 1)  # Green
-        )
-        
-        # Speed limit
-        self._create_text_element(
-            "limit",
-            "Limit: 80 km/h",
-            x=0.05,
-            y=0.78,
-            scale=0.06,
-            color=(1.0, 1.0, 1.0, 1)  # White
-        )
-        
-        # Zone name
-        self._create_text_element(
-            "zone",
-            "Zone: Highway",
-            x=0.05,
-            y=0.71,
-            scale=0.06,
-            color=(1.0, 1.0, 1.0, 1)  # White
-        )
-        
-        # System state (color-coded)
-        self._create_text_element(
-            "state",
-            "State: NORMAL",
-            x=0.05,
-            y=0.64,
-            scale=0.06,
-            color=(0.0, 1.0, 0.0, 1)  # Green (NORMAL)
-        )
+        # Static and dynamic text live in separate subgraphs so the static
+        # one can be flattened without freezing text that still changes
+        self._hud_root = self.base.render2d.attachNewNode("hud")
+        self._hud_static = self._hud_root.attachNewNode("hud_static")
+        self._hud_dyn = self._hud_root.attachNewNode("hud_dyn")
         
-        # GPS coordinates
-        self._create_text_element(
-            "gps",
-            "GPS: (0.000000, 0.000000)",
-            x=0.05,
-            y=0.57,
-            scale=0.05,
-            color=(0.8, 0.8, 0.8, 1)  # Light gray
-        )
-        
-        # MQTT Status
-        self._create_text_element(
-            "mqtt",
-            "MQTT: [Connecting...]",
+        # Left column: title and live readouts, drawn as one multi-line TextNode
+        self._create_text_column(
+            "left",
             x=0.05,
-            y=0.50,
-            scale=0.05,
-            color=(1.0, 1.0, 0.0, 1)  # Yellow (connecting)
-        )
-        
-        # Overspeed indicator
-        self._create_text_element(
-            "overspeed",
-            "Overspeed: 0 km/h",
-            x=0.05,
-            y=0.43,
-            scale=0.05,
-            color=(1.0, 1.0, 1.0, 1)  # White
-        )
-        
-        # Regulation factor
-        self._create_text_element(
-            "regulation",
-            "Regulation: 100%",
-            x=0.05,
-            y=0.36,
-            scale=0.05,
-            color=(1.0, 1.0, 1.0, 1)  # White
-        )
-        
-        # Controls help
-        self._create_text_element(
-            "controls_title",
-            "CONTROLS:",
-            x=0.70,
             y=0.95,
-            scale=0.06,
-            color=(1.0, 1.0, 1.0, 1)  # White
+            rows=[
+                ("title", "SMART SPEED CONTROL SYSTEM", 0.08, CYAN),
+                ("speed", "Speed: 0 km/h", 0.07, GREEN),  # Large
+                ("limit", "Limit: 80 km/h", 0.06, WHITE),
+                ("zone", "Zone: Highway", 0.06, WHITE),
+                ("state", "State: NORMAL", 0.06, GREEN),  # NORMAL
+                ("gps", "GPS: (0.000000, 0.000000)", 0.05, LIGHT_GRAY),
+                ("mqtt", "MQTT: [Connecting...]", 0.05, YELLOW),  # Connecting
+                ("overspeed", "Overspeed: 0 km/h", 0.05, WHITE),
+                ("regulation", "Regulation: 100%", 0.05, WHITE),
+            ]
         )
         
-        self._create_text_element(
+        # Right column: controls help (never changes, so it is built once)
+        self._create_text_column(
             "controls",
-            "UP/DOWN - Throttle/Brake\nLEFT/RIGHT - Steer\nR - Reset",
             x=0.70,
-            y=0.88,
-            scale=0.05,
-            color=(0.7, 0.7, 0.7, 1)  # Gray
+            y=0.95,
+            rows=[
+                ("controls_title", "CONTROLS:", 0.06, WHITE),
+                ("controls", "UP/DOWN - Throttle/Brake\nLEFT/RIGHT - Steer\nR - Reset",
+                 0.05, GRAY),
+            ],
+            static=True
         )
         
         # FPS counter
@@ -161,10 +131,14 @@ class HUD:
             x=0.70,
             y=0.05,
             scale=0.05,
-            color=(1.0, 1.0, 1.0, 1)  # White
+            color=WHITE
         )
+        
+        # Bake the static text's transforms into its vertices and merge its
+        # Geoms into as few as possible
+        self._hud_static.flattenStrong()
     
-    def _create_text_element(self, name, text, x, y, scale, color):
+    def _create_text_element(self, name, text, x, y, scale, color, parent=None):
         """
         Create a text element on the screen.
         
@@ -175,23 +149,143 @@ class HUD:
             y (float): Vertical position (0-1)
             scale (float): Text scale
             color (tuple): RGBA color
+            parent (NodePath): Node to attach to (defaults to the dynamic HUD group)
         """
+        if TextNode is None:
+            self.text_elements[name] = None
+            return
+        
         # Use Panda3D's TextNode for direct text rendering
         try:
-            from panda3d.core import TextNode
             text_node = TextNode("text_" + name)
             text_node.setText(text)
-            text_np = self.base.render2d.attachNewNode(text_node)
+            text_np = (parent if parent is not None else self._hud_dyn).attachNewNode(text_node)
             text_np.setScale(scale * 0.1)
             text_np.setX(x - 1.0)  # Convert from 0-1 to -1 to 1
             text_np.setY(y - 1.0)
             text_node.setTextColor(*color)
-            self.text_elements[name] = text_np
+            self.text_elements[name] = (text_np, text_node)
+            self._text_cache[name] = [text, color]
         except Exception as e:
             # Fallback if TextNode not available
             print(f"[HUD] Warning: Could not create text element '{name}': {e}")
             self.text_elements[name] = None
     
+    def _create_static_text(self, name, text, x, y):
+        """
+        Create text that never changes as plain geometry under the static group.
+        
+        The TextNode is only used to generate the glyph Geoms; attaching
+        those instead of the live node gives flattenStrong() real geometry
+        to merge and bake the transform into.
+        
+        Args:
+            name (str): Unique identifier for this text
+            text (str): Text to display (may contain embedded properties)
+            x (float): Horizontal position (0-1)
+            y (float): Vertical position (0-1)
+        """
+        try:
+            text_node = TextNode("text_" + name)
+            text_node.setText(text)
+            text_node.setTextColor(*WHITE)
+            text_np = self._hud_static.attachNewNode(text_node.generate())
+            text_np.setScale(0.1)
+            text_np.setX(x - 1.0)  # Convert from 0-1 to -1 to 1
+            text_np.setY(y - 1.0)
+            self._static_elements[name] = text_np
+        except Exception as e:
+            print(f"[HUD] Warning: Could not create static text '{name}': {e}")
+            self._static_elements[name] = None
+    
+    def _create_text_column(self, column, x, y, rows, static=False):
+        """
+        Create one multi-line TextNode holding several HUD rows.
+        
+        Each row keeps its own color and scale through embedded text
+        properties, so the whole column is a single node and draw call.
+        
+        Args:
+            column (str): Unique identifier for the column
+            x (float): Horizontal position (0-1)
+            y (float): Vertical position (0-1)
+            rows (list): (name, text, scale, color) per row, top to bottom
+            static (bool): Render once and keep the column out of the update path
+        """
+        if static:
+            if TextNode is None:
+                self._static_elements[column] = None
+                return
+            text = self._markup((text, color, scale) for name, text, scale, color in rows)
+            self._create_static_text(column, text, x, y)
+            return
+        
+        names = []
+        for name, text, scale, color in rows:
+            self._rows[name] = [text, color, scale, column]
+            names.append(name)
+        self._columns[column] = names
+        
+        if TextNode is None:
+            self.text_elements[column] = None
+            return
+        
+        self._create_text_element(column, "", x, y, scale=1.0, color=WHITE)
+        self._render_column(column)
+    
+    def _render_column(self, column):
+        """
+        Rebuild a column's text from its rows.
+        
+        Args:
+            column (str): Column identifier
+        """
+        element = self.text_elements.get(column)
+        if element is None:
+            return
+        
+        rows = self._rows
+        element[1].setText(self._markup(
+            (rows[name][0], rows[name][1], rows[name][2]) for name in self._columns[column]
+        ))
+    
+    def _markup(self, lines):
+        """
+        Join rows into one text with per-row embedded properties.
+        
+        Args:
+            lines (iterable): (text, color, scale) per row, top to bottom
+        
+        Returns:
+            str: Text for a multi-line TextNode
+        """
+        return "\n".join(
+            "\1%s\1%s\2" % (self._text_properties(color, scale), text)
+            for text, color, scale in lines
+        )
+    
+    def _text_properties(self, color, scale):
+        """
+        Get the registered text-properties name for a row color and scale.
+        
+        Args:
+            color (tuple): RGBA color
+            scale (float): Text scale
+        
+        Returns:
+            str: Properties name for the embedded-properties markup
+        """
+        key = (color, scale)
+        name = self._properties.get(key)
+        if name is None:
+            name = "hud%d" % len(self._properties)
+            props = TextProperties()
+            props.setTextColor(*color)
+            props.setTextScale(scale)
+            TextPropertiesManager.getGlobalPtr().setProperties(name, props)
+            self._properties[key] = name
+        return name
+    
     def update(self, vehicle_state, zone_info, control_state, mqtt_status, dt):
         """
         Update all HUD elements with current data.
@@ -206,86 +300,202 @@ class HUD:
         if not self.base:
             return
         
+        # Frame rate as an exponential moving average of the per-frame dt;
+        # zero-length frames are skipped and each sample is capped at 1000 FPS
+        # so a near-zero dt (first frame, after a stall) cannot spike it
+        if dt > 0:
+            self._fps_ema = 0.9 * self._fps_ema + 0.1 / max(dt, 1e-3)
+        
+        # Refresh at HUD_UPDATE_INTERVAL rather than every rendered frame
+        self._accum += dt
+        if self._accum < self.update_interval:
+            return
+        self._accum = 0.0
+        
+        # Nothing to draw into while the window is closed or inactive
+        win = self.base.win
+        if not win or not win.isActive():
+            return
+        
         # Extract data
         speed = vehicle_state.get("velocity", 0.0)
         position = vehicle_state.get("position", (0, 0, 0))
         limit = zone_info.get("speed_limit", 80)
         zone_name = zone_info.get("zone_name", "Unknown")
         state = control_state.get("state", "NORMAL")
-        state_color = control_state.get("color", (1, 1, 1))
+        state_color = control_state.get("color_rgba", WHITE)
         overspeed = control_state.get("overspeed", 0)
         regulation_factor = control_state.get("regulation_factor", 1.0)
         connected = mqtt_status.get("connected", False)
+        speed_q = round(speed, 1)
+        fps_q = int(self._fps_ema)
+        
+        # The input dicts are refilled in place each frame, so compare their
+        # values: a parked vehicle with an idle link skips the whole update
+        inputs = (speed_q, fps_q, limit, zone_name, state, position,
+                  overspeed, regulation_factor, connected)
+        if inputs == self._last_inputs:
+            return
+        self._last_inputs = inputs
+        
+        # Values are quantized to their displayed precision; a row is only
+        # reformatted when its quantized value changes
+        quant = self._last_quant
+        updaters = self._updaters
         
         # Update speed
-        self._update_text_element(
-            "speed",
-            f"Speed: {speed:.1f} km/h",
-            color=(0.0, 1.0, 0.0, 1) if speed <= limit else (1.0, 0.5, 0.0, 1)
-        )
+        over_limit = speed > limit
+        if quant.get("speed") != (speed_q, over_limit):
+            quant["speed"] = (speed_q, over_limit)
+            updaters["speed"](
+                "Speed: %.1f km/h" % speed_q,
+                ORANGE if over_limit else GREEN
+            )
         
         # Update speed limit
-        self._update_text_element(
-            "limit",
-            f"Limit: {limit:.0f} km/h",
-            color=(1.0, 1.0, 1.0, 1)
-        )
+        if quant.get("limit") != limit:
+            quant["limit"] = limit
+            updaters["limit"](
+                "Limit: %.0f km/h" % limit,
+                WHITE
+            )
         
         # Update zone
-        self._update_text_element(
-            "zone",
-            f"Zone: {zone_name}",
-            color=zone_info.get("color", (1, 1, 1)) + (1,)
-        )
+        if quant.get("zone") != zone_name:
+            quant["zone"] = zone_name
+            updaters["zone"](
+                "Zone: " + zone_name,
+                zone_info.get("color_rgba", WHITE)
+            )
         
         # Update state with color coding
-        state_color_rgba = (state_color[0], state_color[1], state_color[2], 1.0)
-        self._update_text_element(
-            "state",
-            f"State: {state}",
-            color=state_color_rgba
-        )
+        if quant.get("state") != state:
+            quant["state"] = state
+            updaters["state"](
+                "State: " + state,
+                state_color
+            )
         
-        # Update GPS
-        lat = position[0] / 1000.0  # Simulate GPS from coordinates
-        lon = position[1] / 1000.0
-        self._update_text_element(
-            "gps",
-            f"GPS: ({lat:.6f}, {lon:.6f})",
-            color=(0.8, 0.8, 0.8, 1)
-        )
+        # Update GPS (simulated as position / 1000, shown to 6 decimals, so
+        # the text only changes when the position crosses a millimetre step)
+        gps_key = (round(position[0] * 1000), round(position[1] * 1000))
+        if quant.get("gps") != gps_key:
+            quant["gps"] = gps_key
+            updaters["gps"](
+                _gps_text(position[0], position[1]),
+                LIGHT_GRAY
+            )
         
         # Update MQTT status
-        mqtt_text = "[Connected]" if connected else "[Disconnected]"
-        mqtt_color = (0.0, 1.0, 0.0, 1) if connected else (1.0, 0.0, 0.0, 1)
-        self._update_text_element(
-            "mqtt",
-            f"MQTT: {mqtt_text}",
-            color=mqtt_color
-        )
+        if quant.get("mqtt") != connected:
+            quant["mqtt"] = connected
+            mqtt_text = "[Connected]" if connected else "[Disconnected]"
+            mqtt_color = GREEN if connected else RED
+            updaters["mqtt"](
+                "MQTT: " + mqtt_text,
+                mqtt_color
+            )
         
         # Update overspeed
-        self._update_text_element(
-            "overspeed",
-            f"Overspeed: {overspeed:.1f} km/h",
-            color=(1.0, 0.0, 0.0, 1) if overspeed > 0 else (1.0, 1.0, 1.0, 1)
-        )
+        overspeed_q = round(overspeed, 1)
+        overspeeding = overspeed > 0
+        if quant.get("overspeed") != (overspeed_q, overspeeding):
+            quant["overspeed"] = (overspeed_q, overspeeding)
+            updaters["overspeed"](
+                "Overspeed: %.1f km/h" % overspeed_q,
+                RED if overspeeding else WHITE
+            )
         
         # Update regulation factor
         reg_percent = int(regulation_factor * 100)
-        self._update_text_element(
-            "regulation",
-            f"Regulation: {reg_percent}%",
-            color=(1.0, 1.0, 1.0, 1)
-        )
+        if quant.get("regulation") != reg_percent:
+            quant["regulation"] = reg_percent
+            updaters["regulation"](
+                "Regulation: %d%%" % reg_percent,
+                WHITE
+            )
+        
+        # Re-render columns whose rows changed (one setText per column)
+        if self._dirty_columns:
+            for column in self._dirty_columns:
+                self._render_column(column)
+            self._dirty_columns.clear()
         
         # Update FPS
-        fps = self.base.clock.getAverageFrameRate()
-        self._update_text_element(
-            "fps",
-            f"FPS: {fps:.0f}",
-            color=(1.0, 1.0, 1.0, 1)
-        )
+        if quant.get("fps") != fps_q:
+            quant["fps"] = fps_q
+            updaters["fps"](
+                "FPS: %d" % fps_q,
+                WHITE
+            )
+    
+    def _build_updaters(self):
+        """
+        Build one updater closure per HUD element.
+        
+        Each closure captures its element's state (column row, or TextNode
+        and cache slot) so update() applies a change without looking the
+        element up or dispatching through a generic method.
+        
+        Returns:
+            dict: Element name -> callable(text, color=None)
+        """
+        updaters = {}
+        for name, row in self._rows.items():
+            updaters[name] = self._make_row_updater(row)
+        for name, element in self.text_elements.items():
+            if name in self._columns:
+                continue
+            if element is None:
+                updaters[name] = _noop_updater
+            else:
+                cache = self._text_cache[name]
+                updaters[name] = self._make_element_updater(element[1], cache)
+        return updaters
+    
+    def _make_row_updater(self, row):
+        """
+        Create the updater for a column row.
+        
+        Args:
+            row (list): The row's [text, color, scale, column] entry
+        
+        Returns:
+            callable: updater(text, color=None)
+        """
+        dirty = self._dirty_columns
+        column = row[3]
+        
+        def update_row(text, color=None):
+            # Record the change; the column is re-rendered once per update
+            if text == row[0] and (color is None or color == row[1]):
+                return
+            row[0] = text
+            if color is not None:
+                row[1] = color
+            dirty.add(column)
+        return update_row
+    
+    def _make_element_updater(self, text_node, cache):
+        """
+        Create the updater for a standalone TextNode.
+        
+        Args:
+            text_node (TextNode): Node to update
+            cache (list): [text, color] last applied to the node
+        
+        Returns:
+            callable: updater(text, color=None)
+        """
+        def update_element(text, color=None):
+            # setText() regenerates the glyph geometry, so only touch what changed
+            if text != cache[0]:
+                text_node.setText(text)
+                cache[0] = text
+            if color is not None and color != cache[1]:
+                text_node.setTextColor(*color)
+                cache[1] = color
+        return update_element
     
     def _update_text_element(self, name, text, color=None):
         """
@@ -296,27 +506,7 @@ class HUD:
             text (str): New text to display
             color (tuple): Optional RGBA color
         """
-        if name not in self.text_elements:
-            return
-        
-        element = self.text_elements[name]
-        if element is None:
-            return
-        
-        try:
-            # Update text - access the TextNode directly from the NodePath
-            if hasattr(element, 'node'):
-                text_node = element.node()
-                if hasattr(text_node, 'setText'):
-                    text_node.setText(text)
-            
-            # Update color if provided
-            if color and hasattr(element, 'node'):
-                text_node = element.node()
-                if hasattr(text_node, 'setTextColor'):
-                    text_node.setTextColor(*color)
-        except Exception as e:
-            pass  # Silent fail if not supported
+        self._updaters.get(name, _noop_updater)(text, color)
     
     def get_hud_data(self):
         """
@@ -326,6 +516,7 @@ class HUD:
             dict: Current HUD state
         """
         return {
-            "elements": list(self.text_elements.keys()),
+            "elements": list(self._rows) + [name for name in self.text_elements if name not in self._columns]
+                        + list(self._static_elements),
             "update_interval": self.update_interval
         }